@@ -0,0 +1,101 @@
+"""This file contains functions for reading and writing versioned binary
+snapshots, a sectioned file format that can be memory-mapped.
+
+File layout (native byte order, 8-byte aligned sections):
+    magic: 8 bytes, b'SGSNAP\\x00\\x00'
+    version: uint16
+    byte order: uint16
+    section count: uint32
+    section table: per section, an 8-byte name, a uint64 offset and
+        a uint64 byte length
+    section data
+"""
+import mmap
+import struct
+import sys
+from typing import Union
+
+
+MAGIC = b'SGSNAP\x00\x00'
+VERSION = 1
+# byte order marker, snapshots are only readable on the same byte order
+BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+HEADER = struct.Struct('=8sHHI') # magic, version, byte order, sections
+SECTION = struct.Struct('=8sQQ') # name, offset, length
+ALIGNMENT = 8
+
+
+def is_snapshot(file_path: str) -> bool:
+    """Returns True if the given file is a snapshot, False otherwise."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(file_path: str,
+                   sections: dict[str, Union[bytes, memoryview]]) -> None:
+    """Writes the given sections into a snapshot file.
+
+    Args:
+        file_path: A str file path to write to.
+        sections: A dict mapping str section names (at most 8 ASCII
+            characters) to bytes-like section data, e.g. bytes or arrays.
+
+    Returns:
+        None.
+    """
+    table_end = HEADER.size + SECTION.size * len(sections)
+    offset = _align(table_end)
+    table = []
+    for name, data in sections.items():
+        length = memoryview(data).nbytes
+        table.append((name.encode('ascii'), offset, length))
+        offset = _align(offset + length)
+    with open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, len(sections)))
+        for entry in table:
+            f.write(SECTION.pack(*entry))
+        for (_, offset, _), data in zip(table, sections.values()):
+            f.write(b'\x00' * (offset - f.tell()))
+            f.write(data)
+
+
+def read_snapshot(file_path: str) -> dict[str, memoryview]:
+    """Memory-maps a snapshot file and returns its sections.
+
+    Section data is not copied, the returned memoryviews are backed by
+    the read-only memory map and shared through the OS page cache.
+
+    Args:
+        file_path: A str file path of a file written by write_snapshot().
+
+    Returns:
+        A dict mapping str section names to memoryviews of section data.
+
+    Raises:
+        ValueError: If the file is not a readable snapshot.
+    """
+    with open(file_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    magic, version, byte_order, count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f'{file_path} is not a snapshot.')
+    if version != VERSION or byte_order != BYTE_ORDER:
+        raise ValueError(f'{file_path} has snapshot version {version} and '
+                         f'byte order {byte_order}, expected version '
+                         f'{VERSION} and byte order {BYTE_ORDER}.')
+    sections = {}
+    for i in range(count):
+        name, offset, length = SECTION.unpack_from(
+            view, HEADER.size + SECTION.size * i)
+        sections[name.rstrip(b'\x00').decode('ascii')] = \
+            view[offset:offset+length]
+    return sections
+
+
+def _align(offset: int) -> int:
+    """Rounds an int offset up to the section alignment."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -1,8 +1,22 @@
 """This file contains functions for running graph algorithms
 compatible with the UndirectedGraph class.
 """
+from collections import deque # push queue for personalized_pagerank
+from heapq import heappop, heappush, nsmallest # binary heap for lazy_dijkstra
+from typing import Callable, Iterable, Iterator
+# optional, for batch_top_k
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+    HAS_CSGRAPH = True
+except ImportError:
+    HAS_CSGRAPH = False
+
+
 from src.minimum_heap.min_heap import MinHeap # minimum heap for dijkstra
 from src.graphs.search_graph import SearchGraph # for typing
+from src.graphs.sparse_adjacency import SparseAdjacency # for row costs
 
 
 def dijkstra(graph: SearchGraph, src: int) -> MinHeap:
@@ -19,7 +33,7 @@ def dijkstra(graph: SearchGraph, src: int) -> MinHeap:
         A MinHeap with Vertices sorted by shortest path to longest.
     """
     # check if src in graph
-    if src >= len(graph):
+    if src >= len(graph.items) or src in graph.removed:
         return None
     # instantiate data strucutres for algorithm
     known = set()
@@ -54,4 +68,250 @@ def dijkstra(graph: SearchGraph, src: int) -> MinHeap:
                 min_heap.change_priority(v, new_dist)
             else:
                 min_heap.add(v, new_dist)
-    return result
\ No newline at end of file
+    return result
+
+
+def dijkstra_top_k(graph: SearchGraph, 
+                   src: int, 
+                   limit: int) -> list[tuple[int, float]]:
+    """Finds the limit nearest SearchItems from a given graph and source
+    using Dijkstra's Shortest Path algorithm, stopping as soon as limit 
+    SearchItems have been settled.
+    
+    Returns None if given source is invalid or not in graph.
+    
+    Args:
+        graph: A SearchGraph.
+        src: A source SearchItem index in the graph.
+        limit: An int number of nearest SearchItems to find.
+        
+    Returns:
+        A list of tuples of SearchItem index and distance, sorted by
+        shortest path to longest. The source itself is excluded.
+    """
+    # check if src in graph
+    if src >= len(graph.items) or src in graph.removed:
+        return None
+    known = set()
+    dist_to: dict[int, float] = {src: 0} # source distance
+    results = []
+    min_heap = MinHeap()
+    min_heap.add(src, 0)
+    while min_heap.size() > 0 and len(results) < limit:
+        u = min_heap.pop() # shortest dist in queue
+        known.add(u)
+        if u != src:
+            results.append((u, dist_to[u]))
+        # traverse through edges
+        for v, weight in graph.get_edges(u):
+            if v in known:
+                continue
+            new_dist = dist_to[u] + weight
+            # ignore if new distance is not shorter than old
+            if new_dist >= dist_to.get(v, float('inf')):
+                continue
+            dist_to[v] = new_dist
+            # update min heap
+            if v in min_heap:
+                min_heap.change_priority(v, new_dist)
+            else:
+                min_heap.add(v, new_dist)
+    return results
+
+
+def lazy_dijkstra(graph: SearchGraph, 
+                  src: int, 
+                  limit: int=None,
+                  max_dist: float=None) -> list[tuple[int, float]]:
+    """Finds the limit nearest SearchItems from a given graph and source
+    using Dijkstra's Shortest Path algorithm on a heapq binary heap.
+    
+    Instead of changing priorities, shorter paths push a new heap entry
+    and outdated entries are skipped when popped. Distances are kept in 
+    flat lists indexed by SearchItem index.
+    
+    Returns None if given source is invalid or not in graph.
+    
+    Args:
+        graph: A SearchGraph.
+        src: A source SearchItem index in the graph.
+        limit: An (optional) int number of nearest SearchItems to find.
+            Defaults to all reachable SearchItems.
+        max_dist: An (optional) float maximum distance of SearchItems 
+            to find. Defaults to no limit.
+        
+    Returns:
+        A list of tuples of SearchItem index and distance, sorted by
+        shortest path to longest. The source itself is excluded.
+    """
+    size = len(graph.items)
+    # check if src in graph
+    if src >= size or src in graph.removed:
+        return None
+    if limit is None:
+        limit = size
+    if max_dist is None:
+        max_dist = float('inf')
+    dist_to = [float('inf')] * size # source distance
+    dist_to[src] = 0
+    known = bytearray(size)
+    get_edges = graph.get_edges
+    results = []
+    heap = [(0, src)]
+    while heap and len(results) < limit:
+        dist, u = heappop(heap)
+        if dist > max_dist:
+            break
+        # skip outdated heap entries
+        if known[u]:
+            continue
+        known[u] = 1
+        if u != src:
+            results.append((u, dist))
+        for v, weight in get_edges(u):
+            new_dist = dist + weight
+            if new_dist < dist_to[v]:
+                dist_to[v] = new_dist
+                heappush(heap, (new_dist, v))
+    return results
+
+
+def personalized_pagerank(graph: SearchGraph,
+                          src: int,
+                          limit: int,
+                          alpha: float=0.15,
+                          tol: float=1e-4,
+                          max_work: int=200000) -> list[tuple[int, float]]:
+    """Ranks the SearchItems around a given source by random walk with 
+    restart (personalized PageRank), using push-based approximation.
+    
+    The walk moves from an item to a neighbor with probability proportional
+    to the similarity 1 / (1 + weight) of their edge, and restarts at the 
+    source with probability alpha. An item is pushed once its residual 
+    reaches tol times its degree (Andersen-Chung-Lang), so pushes scan at 
+    most 1 / (alpha * tol) edges in total, independent of the graph size.
+    
+    This bound needs the sparse backend. A dense row is scanned in full 
+    for its edges and its degree, so every scanned slot counts towards 
+    max_work and the approximation gets coarser as the graph grows.
+    SearchEngine converts dense graphs to the sparse backend for this
+    algorithm.
+    
+    Returns None if given source is invalid or not in graph.
+    
+    Args:
+        graph: A SearchGraph.
+        src: A source SearchItem index in the graph.
+        limit: An int number of top-ranked SearchItems to return.
+        alpha: An (optional) float restart probability. Defaults to 0.15.
+        tol: An (optional) float residual tolerance per edge, smaller 
+            residuals are not pushed. Defaults to 1e-4.
+        max_work: An (optional) int maximum number of edges scanned
+            by pushes, or row slots on the dense backend. 
+            Defaults to 200000.
+        
+    Returns:
+        A list of tuples of SearchItem index and float score, sorted by
+        highest score to lowest. The source itself is excluded.
+    """
+    # check if src in graph
+    if src >= len(graph.items) or src in graph.removed:
+        return None
+    scores: dict[int, float] = {}
+    residuals: dict[int, float] = {src: 1.0}
+    degrees: dict[int, int] = {} # cached push thresholds
+    # slots scanned per dense row, None if only edges are scanned
+    row_cost = None if isinstance(graph.graph, SparseAdjacency) \
+        else len(graph.graph)
+    queue = deque([src])
+    queued = {src}
+    work = 0
+    while queue and work < max_work:
+        u = queue.popleft()
+        queued.discard(u)
+        residual = residuals.pop(u)
+        scores[u] = scores.get(u, 0.0) + alpha * residual
+        edges = [(v, 1 / (1 + weight)) for v, weight in graph.get_edges(u)]
+        work += len(edges) if row_cost is None else row_cost
+        total = sum(similarity for _, similarity in edges)
+        # nothing to walk to from an isolated source
+        if not total:
+            continue
+        walk = (1 - alpha) * residual / total
+        for v, similarity in edges:
+            residuals[v] = residuals.get(v, 0.0) + walk * similarity
+            if v in queued:
+                continue
+            degree = degrees.get(v)
+            if degree is None:
+                degree = degrees[v] = graph.get_degree(v)
+                if row_cost is not None:
+                    work += row_cost
+            if residuals[v] >= tol * degree:
+                queued.add(v)
+                queue.append(v)
+    scores.pop(src, None)
+    return nsmallest(limit, scores.items(), key=lambda x: (-x[1], x[0]))
+
+
+# top-k functions selectable by name
+TOP_K_ALGORITHMS: dict[str, Callable] = {
+    'dijkstra': dijkstra_top_k,
+    'lazy_dijkstra': lazy_dijkstra,
+    'personalized_pagerank': personalized_pagerank,
+}
+# top-k functions that rank by shortest path, see batch_top_k()
+SHORTEST_PATH_ALGORITHMS = {'dijkstra', 'lazy_dijkstra'}
+
+
+def batch_top_k(graph: SearchGraph, 
+                sources: Iterable[int], 
+                limit: int,
+                block_size: int=256) -> Iterator[tuple[int, list[tuple[int, float]]]]:
+    """Finds the limit nearest SearchItems for many sources at once.
+    
+    If scipy is available, the shortest paths of each block of sources
+    are computed together by scipy.sparse.csgraph over the compressed
+    sparse row edges. Otherwise every source runs lazy_dijkstra().
+    
+    Args:
+        graph: A SearchGraph.
+        sources: An iterable of source SearchItem indices in the graph.
+        limit: An int number of nearest SearchItems to find per source.
+        block_size: An (optional) int number of sources computed together.
+            Defaults to 256.
+            
+    Returns:
+        An iterator containing a tuple of source index and a list of tuples
+        of SearchItem index and distance, sorted by shortest path to 
+        longest. Invalid sources yield an empty list.
+    """
+    sources = list(sources)
+    if not HAS_CSGRAPH:
+        for src in sources:
+            yield src, lazy_dijkstra(graph, src, limit) or []
+        return
+    adjacency = graph.to_sparse()
+    size = len(adjacency)
+    matrix = csr_matrix((np.frombuffer(adjacency.weights, dtype=np.float64),
+                         np.frombuffer(adjacency.indices, dtype=np.int32),
+                         np.frombuffer(adjacency.offsets, dtype=np.int64)),
+                        shape=(size, size))
+    k = min(limit, size - 1)
+    for start in range(0, len(sources), block_size):
+        block = [src for src in sources[start:start+block_size] 
+                 if src < size and src not in graph.removed]
+        dists = {}
+        if block:
+            dists = dict(zip(block, csgraph_dijkstra(matrix, directed=True, 
+                                                     indices=block)))
+        for src in sources[start:start+block_size]:
+            if src not in dists:
+                yield src, []
+                continue
+            dist = dists[src]
+            dist[src] = np.inf
+            nearest = np.argpartition(dist, k)[:k]
+            nearest = nearest[np.isfinite(dist[nearest])]
+            nearest = nearest[np.argsort(dist[nearest], kind='stable')]
+            yield src, [(int(i), float(dist[i])) for i in nearest]
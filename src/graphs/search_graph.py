@@ -1,18 +1,112 @@
 """This file contains SearchGraph, a base graph class built 
 with a word trie for a search engine implementation.
 """
+from heapq import nlargest, nsmallest
 from io import FileIO # typing
+from multiprocessing import Pool, cpu_count
 from numbers import Number # typing
-from typing import Any, Callable, Iterator # typing
+from operator import itemgetter
+from threading import RLock
+from typing import Any, Callable, Iterable, Iterator # typing
+from time import time
 import random
 import pickle
 
 
+from src.graphs.graph_snapshot import is_snapshot, read_snapshot, write_snapshot
 from src.graphs.search_item import SearchItem
+from src.graphs.sparse_adjacency import SparseAdjacency
 from src.trie.word_trie import WordTrie
-from src.minimum_heap.min_heap import MinHeap
 from src.utils.formatting import wordtrie_format
-from src.utils.item_interest import ItemInterest
+from src.utils.interest_buffer import ShardedInterestBuffer
+from src.utils.item_interest import DecayClock, ItemInterest
+from src.utils.trending_index import TrendingIndex
+
+
+def batch_weight_func(weight_func: Callable, mode: str='block') -> Callable:
+    """Wraps a weight function into a block weight function.
+    
+    Args:
+        weight_func: A callable function to calculate edge weights,
+            see SearchGraph.add_items() for the calling conventions.
+        mode: An (optional) str weight_func calling convention, one of
+            'block', 'row' or 'pair'. Defaults to 'block'.
+            
+    Returns:
+        A callable that takes a list of SearchItems and a list of 
+        SearchItems and returns a 2D sequence of float weights.
+    """
+    if mode == 'block':
+        return weight_func
+    if mode == 'row':
+        return lambda block, items: [weight_func(item, items) 
+                                     for item in block]
+    if mode == 'pair':
+        return lambda block, items: [[weight_func(item, other) 
+                                      for other in items] 
+                                     for item in block]
+    raise ValueError(f'unknown weight function mode "{mode}".')
+
+
+def score_rows(items: list[SearchItem], 
+               block_func: Callable, 
+               weight_thres: Number,
+               start: int, 
+               end: int,
+               removed: set[int]=frozenset()) -> list[list[tuple[int, Number]]]:
+    """Scores the SearchItems in items[start:end] against every SearchItem
+    before them.
+    
+    Args:
+        items: A list of SearchItems.
+        block_func: A block weight function, see batch_weight_func().
+        weight_thres: A numerical threshold value for edge weights.
+            Weights above this threshold will be ignored.
+        start: An int index of the first SearchItem to score.
+        end: An int index of the last SearchItem to score (exclusive).
+        removed: An (optional) set of removed SearchItem indices to
+            ignore. Defaults to none.
+        
+    Returns:
+        A list of rows, one per scored SearchItem, containing tuples
+        of SearchItem index and edge weight.
+    """
+    rows = []
+    weights = block_func(items[start:end], items[:end])
+    for i, row in enumerate(weights, start):
+        rows.append([(j, weight) for j, weight in enumerate(row[:i]) 
+                     if weight <= weight_thres and j not in removed])
+    return rows
+
+
+# per-process state for build_parallel() workers
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(items: list[SearchItem], 
+                 weight_func: Callable, 
+                 weight_thres: Number, 
+                 mode: str,
+                 removed: set[int]) -> None:
+    """Stores the build_parallel() arguments once per worker process."""
+    _worker['items'] = items
+    _worker['block_func'] = batch_weight_func(weight_func, mode)
+    _worker['weight_thres'] = weight_thres
+    _worker['removed'] = removed
+
+
+def _score_worker_rows(bounds: tuple[int, int]) -> list[list[tuple[int, Number]]]:
+    """Scores a (start, end) block of rows inside a worker process."""
+    start, end = bounds
+    return score_rows(_worker['items'], _worker['block_func'], 
+                      _worker['weight_thres'], start, end, _worker['removed'])
+
+
+# ratio of removed indices before remove() compacts the SearchGraph
+COMPACT_RATIO = 0.25
+# buffered interest events and seconds before they are flushed
+INTEREST_BUFFER_SIZE = 1024
+INTEREST_FLUSH_INTERVAL = 1.0
 
 
 class SearchGraph:
@@ -20,43 +114,64 @@ class SearchGraph:
     lists. Contains a built-in WordTrie for search engine purposes.
     
     This implementation of the undirected graph aims to optimize
-    for memory usage.
+    for memory usage. A compressed sparse row backend can be selected
+    for large graphs where most edges are pruned by the weight threshold.
     
     Attributes:
-        graph: An adjacency matrix implemented using 2-dimensional lists.
+        graph: An adjacency matrix implemented using 2-dimensional lists,
+            or a SparseAdjacency if the sparse backend is selected.
         items: A list of SearchItems.
+        removed: A set of removed SearchItem indices awaiting compact().
         words: A WordTrie containing all the SearchItem names.
         size: The active size of the adjacency matrix.
     """
-    def __init__(self, init_file: str=None) -> None:
+    def __init__(self, 
+                 init_file: str=None, 
+                 sparse: bool=False,
+                 max_degree: int=None,
+                 half_life: float=None) -> None:
         """Constructs a SearchGraph.
         
         Args:
             init_file: A str filepath to init a SearchGraph from. This file 
             should be a file generated by SearchGraph's save_instance().
+            sparse: An (optional) bool to store edges in a compressed sparse
+                row SparseAdjacency instead of a dense matrix. 
+                Defaults to False.
+            max_degree: An (optional) int maximum number of edges per
+                SearchItem. Only the lightest edges are kept as new items
+                are added. Defaults to no limit.
+            half_life: An (optional) float number of seconds for interests
+                to halve, used to rank trending SearchItems by recent 
+                interest. Defaults to all-time interest.
             
         Returns:
             None.
         """
         # for graphs
-        self.graph: list[list[Number]] = [] # 2D matrix
+        self.graph = SparseAdjacency() if sparse else [] # 2D matrix or CSR
+        self.max_degree = max_degree # max edges per SearchItem
         self.items: list[SearchItem] = [] # stores SearchItem data
         self.item_dict: dict[str, int] = {} # maps SearchItem names to index
+        self.removed: set[int] = set() # removed SearchItem indices
         # for tags
         self.tag_dict: dict[str, int] = {} # maps tag to index
         self.tag_interest: list[ItemInterest] = [] # stores tags information
         self.tag_item: list[set[int]] = [] # maps tag to SearchItem index
         # for autocomplete
         self.words = WordTrie()
-        # for sorting interests
-        self.interests = MinHeap()
+        # for trending interests
+        self.interests = TrendingIndex()
+        self.clock = DecayClock(half_life) if half_life else None
+        self._init_runtime()
         # load stored data if available
         if init_file:
             self.load_instance(init_file)
         
     def __iter__(self) -> Iterator[SearchItem]:
         """Returns an iterator over all SearchItems."""
-        return iter(self.items)
+        return (item for i, item in enumerate(self.items) 
+                if i not in self.removed)
     
     def __contains__(self, item_name: str) -> bool:
         """Returns True if item_name is in SearchGraph, False otherwise."""
@@ -66,13 +181,32 @@ class SearchGraph:
         """Returns a SearchItem from a str item name."""
         return self.get_item(item_name)
     
+    def __getstate__(self) -> dict[str, Any]:
+        """Returns the attributes to pickle, excluding private 
+        runtime attributes such as open files."""
+        return {name: attr for name, attr in vars(self).items()
+                if not name.startswith('_')}
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores a pickled SearchGraph, recreating the private runtime
+        attributes excluded by __getstate__()."""
+        self.__dict__.update(state)
+        self._init_runtime()
+        
+    def _init_runtime(self) -> None:
+        """Sets the private runtime attributes, which are not pickled."""
+        self._events = ShardedInterestBuffer(INTEREST_BUFFER_SIZE, 
+                                             INTEREST_FLUSH_INTERVAL)
+        self._flush_lock = RLock() # serializes interest updates
+    
     def __len__(self) -> int:
         """Returns the active size of the adjacency matrix."""
         return len(self.item_dict)
     
     def add_item(self, item: SearchItem, 
                  weight_func: Callable,
-                 weight_thres: Number) -> None:
+                 weight_thres: Number,
+                 candidates: Callable=None) -> None:
         """Adds a new SearchItem to the SearchGraph.
         
         Item name cannot be added if already exists.
@@ -84,10 +218,17 @@ class SearchGraph:
                 as arguments and return a float weight.
             weight_thres: A numerical threshold value for edge weights.
                 Weights above this threshold will be ignored.
+            candidates: An (optional) callable that takes the SearchGraph 
+                and the new SearchItem and returns an iterable of existing
+                SearchItem indices to score, e.g. SearchGraph.tag_candidates.
+                All other pairs are treated as missing edges. Defaults to
+                scoring every existing SearchItem.
                 
         Returns:
             None.
         """
+        if self._is_frozen('add_item'):
+            return
         # WordTrie format name
         wtf_name = wordtrie_format(item.get_name())
         # do nothing if name already exists
@@ -102,20 +243,221 @@ class SearchGraph:
         self.item_dict[wtf_name] = size 
         self.items.append(item)
         new_edges = []
+        # never connect to removed SearchItems
+        if candidates is None:
+            indices = (i for i in range(size) if i not in self.removed)
+        else:
+            indices = sorted(i for i in candidates(self, item) 
+                             if i < size and i not in self.removed)
         # add edge weights to Graph
-        for i in range(size):
+        for i in indices:
             weight = weight_func(item, self.items[i])
-            if weight > weight_thres:
-                weight = None
-            new_edges.append(weight)
-            self.graph[i].append(weight)
-        # set itself to weight 0
-        new_edges.append(0)
-        self.graph.append(new_edges)
+            if weight <= weight_thres:
+                new_edges.append((i, weight))
+        self._add_edges([new_edges])
         # add tags
         self._add_tags(item)
         # sort by interest
-        self.interests.add(size, -1 * item.get_interest())
+        with self._flush_lock:
+            self.interests.update(size, self._interest(item))
+        
+    def _add_edges(self, rows: list[list[tuple[int, Number]]]) -> None:
+        """Adds new rows to the adjacency. Each row is a list of tuples of 
+        SearchItem index and edge weight, where indices refer to existing 
+        SearchItems or earlier rows of the same block.
+        
+        If max_degree is set, rows are added one at a time keeping only
+        the lightest max_degree edges of every SearchItem."""
+        if self.max_degree is None:
+            self._append_rows(rows)
+            return
+        for edges in rows:
+            edges = nsmallest(self.max_degree, edges, key=itemgetter(1))
+            self._append_rows([edges])
+            for j, _ in edges:
+                self._bound_degree(j)
+                
+    def _bound_degree(self, item_index: int) -> None:
+        """Removes the heaviest edges of a SearchItem until its
+        degree is at most max_degree."""
+        edges = list(self.get_edges(item_index))
+        excess = len(edges) - self.max_degree
+        if excess <= 0:
+            return
+        for j, _ in nlargest(excess, edges, key=itemgetter(1)):
+            self._remove_edge(item_index, j)
+            
+    def _remove_edge(self, i: int, j: int) -> None:
+        """Removes the undirected edge between two SearchItem indices."""
+        if isinstance(self.graph, SparseAdjacency):
+            self.graph.remove_edge(i, j)
+        else:
+            self.graph[i][j] = None
+            self.graph[j][i] = None
+        
+    def _append_rows(self, rows: list[list[tuple[int, Number]]]) -> None:
+        """Appends new rows to the adjacency in one block."""
+        if isinstance(self.graph, SparseAdjacency):
+            for edges in rows:
+                self.graph.add_node(edges)
+            return
+        size = len(self.graph)
+        count = len(rows)
+        # extend existing rows and allocate new rows
+        padding = [None] * count
+        for row in self.graph:
+            row.extend(padding)
+        for i in range(size, size + count):
+            new_row = [None] * (size + count)
+            # set itself to weight 0
+            new_row[i] = 0
+            self.graph.append(new_row)
+        # fill in edge weights symmetrically
+        for i, edges in enumerate(rows, size):
+            new_row = self.graph[i]
+            for j, weight in edges:
+                new_row[j] = weight
+                self.graph[j][i] = weight
+        
+    def add_items(self, items: Iterable[SearchItem],
+                  weight_func: Callable,
+                  weight_thres: Number,
+                  mode: str='block',
+                  block_size: int=128) -> None:
+        """Adds a batch of new SearchItems to the SearchGraph.
+        
+        Edge weights are computed by a batch-aware weight function in blocks 
+        of new SearchItems, and the WordTrie and tag indexes are updated 
+        once per batch. Item names that already exist are skipped.
+        
+        Args:
+            items: An iterable of SearchItems to add into the graph.
+            weight_func: A callable function to calculate edge weights. 
+                Depending on mode, the callable must take:
+                    'block': a list of new SearchItems and a list of 
+                        SearchItems, and return a 2D sequence of float 
+                        weights with one row per new SearchItem.
+                    'row': a SearchItem and a list of SearchItems, and 
+                        return a sequence of float weights.
+                    'pair': two SearchItems, and return a float weight.
+            weight_thres: A numerical threshold value for edge weights.
+                Weights above this threshold will be ignored.
+            mode: An (optional) str weight_func calling convention.
+                Defaults to 'block'.
+            block_size: An (optional) int number of new SearchItems scored
+                per weight_func block. Defaults to 128.
+                
+        Returns:
+            None.
+        """
+        block_func = batch_weight_func(weight_func, mode)
+        size = len(self.items)
+        new_items = self._register_items(items, 'add_items')
+        # score each block of new items against all items before them
+        rows = []
+        for start in range(size, len(self.items), block_size):
+            end = min(start + block_size, len(self.items))
+            rows.extend(score_rows(self.items, block_func, weight_thres, 
+                                   start, end, self.removed))
+        self._index_items(new_items, rows)
+        
+    def build_parallel(self, items: Iterable[SearchItem],
+                       weight_func: Callable,
+                       weight_thres: Number,
+                       workers: int=cpu_count(),
+                       mode: str='block',
+                       block_size: int=128) -> None:
+        """Adds a batch of new SearchItems to the SearchGraph, computing
+        edge weights in row blocks across a pool of processes.
+        
+        This function uses multiprocessing and must be run 
+        inside a __main__ method. The weight_func must be picklable,
+        e.g. a function defined at the top level of a module.
+        
+        Args:
+            items: An iterable of SearchItems to add into the graph.
+            weight_func: A callable function to calculate edge weights,
+                see add_items() for the calling conventions.
+            weight_thres: A numerical threshold value for edge weights.
+                Weights above this threshold will be ignored.
+            workers: An (optional) int number of processes to run.
+                Defaults to max available processors.
+            mode: An (optional) str weight_func calling convention.
+                Defaults to 'block'.
+            block_size: An (optional) int number of rows scored
+                per task. Defaults to 128.
+                
+        Returns:
+            None.
+        """
+        size = len(self.items)
+        new_items = self._register_items(items, 'build_parallel')
+        if not new_items:
+            return
+        print(f'[STATUS] build_parallel(): '
+              f'Scoring {len(new_items)} items using {workers} processors.')
+        t0 = time()
+        blocks = ((start, min(start + block_size, len(self.items))) 
+                  for start in range(size, len(self.items), block_size))
+        rows = []
+        with Pool(processes=workers, 
+                  initializer=_init_worker, 
+                  initargs=(self.items, weight_func, weight_thres, mode,
+                            self.removed)) as pool:
+            for block_rows in pool.imap(_score_worker_rows, blocks):
+                rows.extend(block_rows)
+        self._index_items(new_items, rows)
+        print(f'[STATUS] build_parallel(): '
+              f'Added {len(new_items)} items.\n'
+              f'   > Finished in {time()-t0} seconds.')
+        
+    def _register_items(self, items: Iterable[SearchItem], 
+                        caller: str) -> list[SearchItem]:
+        """Appends new SearchItems and their names in one batch, skipping
+        names that already exist. Returns the list of new SearchItems."""
+        if self._is_frozen(caller):
+            return []
+        size = len(self.items)
+        new_items = []
+        for item in items:
+            wtf_name = wordtrie_format(item.get_name())
+            # do nothing if name already exists
+            if wtf_name in self.item_dict:
+                print(f'[ABORTED] {caller}(): '
+                      f'item name "{wtf_name}" already exists.')
+                continue
+            self.item_dict[wtf_name] = size + len(new_items)
+            new_items.append(item)
+        self.words.add_words(*(wordtrie_format(item.get_name()) 
+                               for item in new_items))
+        self.items.extend(new_items)
+        return new_items
+    
+    def _index_items(self, new_items: list[SearchItem], 
+                     rows: list[list[tuple[int, Number]]]) -> None:
+        """Adds the edges, tags and interests of registered SearchItems."""
+        if not new_items:
+            return
+        size = len(self.items) - len(new_items)
+        self._add_edges(rows)
+        if isinstance(self.graph, SparseAdjacency):
+            self.graph.compress()
+        # add tags
+        self._add_tags(*new_items)
+        # sort by interest
+        with self._flush_lock:
+            for i, item in enumerate(new_items, size):
+                self.interests.update(i, self._interest(item))
+        
+    def tag_candidates(self, item: SearchItem) -> set[int]:
+        """Returns a set of SearchItem indices sharing at least one tag
+        with the given SearchItem, using the tag inverted index."""
+        results = set()
+        for tag in item.get_tags():
+            tag_index = self.tag_dict.get(wordtrie_format(tag))
+            if tag_index is not None:
+                results.update(self.tag_item[tag_index])
+        return results
         
     def _add_item(self, data: tuple[SearchItem, Callable, Number]) -> None:
         self.add_item(data[0], data[1], data[2])
@@ -147,8 +489,8 @@ class SearchGraph:
             return None
     
     def get_edges(self, item_index: int) -> Iterator[tuple[int, Number]]:
-        """A generator function to iterate over edges from a given
-        source name. 
+        """Returns an iterator over edges from a given source index,
+        skipping removed SearchItems.
         
         Args:
             item_index: An int index of the item.
@@ -161,13 +503,24 @@ class SearchGraph:
             # TODO: Add SearchGraph Exceptions
             print('[ABORTED] get_edges(): '
                 f'item index "{item_index}" does not exist.')
-            return
-        weights = self.graph[item_index]
-        for i in range(size):
-            weight = weights[i]
-            if i == item_index or weight is None:
-                continue
-            yield i, weight
+            return iter(())
+        # iterate over the compressed row directly
+        if isinstance(self.graph, SparseAdjacency):
+            edges = self.graph.neighbors(item_index)
+        else:
+            edges = ((i, weight) 
+                     for i, weight in enumerate(self.graph[item_index])
+                     if weight is not None and i != item_index)
+        if not self.removed:
+            return edges
+        return ((i, weight) for i, weight in edges if i not in self.removed)
+
+    def get_degree(self, item_index: int) -> int:
+        """Returns the int number of edges from a given source index,
+        see get_edges()."""
+        if isinstance(self.graph, SparseAdjacency) and not self.removed:
+            return self.graph.degree(item_index)
+        return sum(1 for _ in self.get_edges(item_index))
 
     def result_matches(self, query: str, limit: int=10) -> list:
         """Takes in a str query and returns a list of possible
@@ -185,82 +538,312 @@ class SearchGraph:
     
     def add_click(self, item_name: str) -> None:
         """Adds click counts for the corresponding item name,
-        can be SearchItem or a str tag."""
+        can be SearchItem or a str tag. Clicks are buffered until
+        the next flush_interests()."""
         wtf_name = wordtrie_format(item_name)
         item_index = self.item_dict[wtf_name]
-        item = self.items[item_index]
-        item.add_click()
-        self.interests.change_priority(item_index, -1 * item.get_interest())
+        if self._events.add_click(item_index):
+            self.flush_interests(due_only=True)
     
     def add_appearance(self, item_index: int) -> None:
-        """Adds appearance counts for the corresponding 
-        SearchItem and its tags given by an index."""
-        item = self.items[item_index]
-        # update tag appearance count
-        for tag in item.get_tags():
-            tag_index = self.tag_dict[wordtrie_format(tag)]
-            self.tag_interest[tag_index].add_appear()
-        # update appearance count
-        item.add_appear()
+        """Adds appearance counts for the corresponding SearchItem and 
+        its tags given by an index. Appearances are buffered until
+        the next flush_interests()."""
+        if self._events.add_appear(item_index):
+            self.flush_interests(due_only=True)
+            
+    def flush_interests(self, due_only: bool=False) -> None:
+        """Applies the buffered clicks and appearances, with one interest
+        update per SearchItem.
+        
+        Buffered events are flushed by add_click() and add_appearance()
+        once a thread buffered INTEREST_BUFFER_SIZE events or 
+        INTEREST_FLUSH_INTERVAL seconds have passed. Events are buffered
+        per thread and merged here, one thread at a time.
+        
+        Args:
+            due_only: An (optional) bool to only flush if a buffer is
+                full or the flush interval has passed, and no other thread
+                is flushing. Defaults to False.
+                
+        Returns:
+            None.
+        """
+        if not len(self._events) or due_only and not self._events.is_due():
+            return
+        # another thread is already flushing
+        if not self._flush_lock.acquire(blocking=not due_only):
+            return
+        try:
+            self._apply_interests(*self._events.drain())
+        finally:
+            self._flush_lock.release()
+            
+    def _apply_interests(self, clicks: dict[int, int], 
+                         appears: dict[int, int]) -> None:
+        """Applies aggregated click and appearance counts by 
+        SearchItem index."""
+        scale = self._event_scale()
+        tags = set()
+        for item_index, count in clicks.items():
+            self.items[item_index].add_click(scale, count)
+        for item_index, count in appears.items():
+            item = self.items[item_index]
+            # update tag appearance count
+            for tag in item.get_tags():
+                tag = wordtrie_format(tag)
+                self.tag_interest[self.tag_dict[tag]].add_appear(scale, count)
+                tags.add(tag)
+            # update appearance count
+            item.add_appear(scale, count)
         # update interest
-        self.interests.change_priority(item_index, -1 * item.get_interest())
+        scores = {}
+        for item_index in clicks.keys() | appears.keys():
+            if item_index not in self.removed:
+                interest = self._interest(self.items[item_index])
+                self.interests.update(item_index, interest)
+                scores[wordtrie_format(self.items[item_index].get_name())] = interest
+        # rank suggestions by interest, tags by interest per SearchItem
+        for tag in tags - self.item_dict.keys():
+            tag_index = self.tag_dict[tag]
+            scores[tag] = self._interest(self.tag_interest[tag_index]) / \
+                max(len(self.tag_item[tag_index]), 1)
+        if not self.words.frozen:
+            self.words.set_scores(scores)
         
     def update_all_interests(self) -> None:
         """Updates the interest for all items in SearchGraph."""
-        for i in range(len(self)):
-            item = self.items[i]
-            interest = item.get_interest()
-            # update if item exists
-            if i in self.interests:
-                self.interests.change_priority(i, -1 * interest)
-            else:
-                self.interests.add(i, -1 * interest)
+        with self._flush_lock:
+            self.flush_interests()
+            for i in range(len(self.items)):
+                if i in self.removed:
+                    continue
+                self.interests.update(i, self._interest(self.items[i]))
+            
+    def _interest(self, item: ItemInterest) -> float:
+        """Returns the float trending score of an item. With a half life, 
+        this is its time-decayed interest in DecayClock scale units."""
+        if self.clock is None:
+            return item.get_interest()
+        return item.decayed
+    
+    def _event_scale(self) -> float:
+        """Returns the float DecayClock scale of an event at the current
+        time, renormalizing all interests first if it grew too large."""
+        if self.clock is None:
+            return 1.0
+        if self.clock.needs_rescale(self.clock.exponent()):
+            factor = self.clock.rescale()
+            for interest in (*self.items, *self.tag_interest):
+                interest.rescale(factor)
+            # deferred by a frozen WordTrie until it is unfrozen
+            self.words.rescale_scores(factor)
+            self.update_all_interests()
+        return self.clock.scale()
 
     def remove(self, item_name: str) -> None:
-        """Removes a given item from the SearchGraph."""
-        # if item_name in self.items:
-        #     self.graph.remove_node(item_name)
-        #     self.items.pop(item_name)
-        #     self.words.remove_words(item_name)
-        NotImplemented
+        """Removes a given item from the SearchGraph.
+        
+        The item index is marked as removed and its edges, name, tags and
+        interest are dropped. Indices are only renumbered by compact(), 
+        which runs once the ratio of removed indices passes COMPACT_RATIO,
+        see _auto_compact().
+        
+        Args:
+            item_name: A str name of the SearchItem to remove.
+            
+        Returns:
+            None.
+        """
+        if self._is_frozen('remove'):
+            return
+        wtf_name = wordtrie_format(item_name)
+        if wtf_name not in self.item_dict:
+            print(f'[KEYERROR] remove(): '
+                  f'item name {item_name} does not exist.')
+            return
+        item_index = self.item_dict.pop(wtf_name)
+        self.removed.add(item_index)
+        self.words.remove_words(wtf_name)
+        # remove from tags
+        for tag in self.items[item_index].get_tags():
+            tag_index = self.tag_dict[wordtrie_format(tag)]
+            self.tag_item[tag_index].discard(item_index)
+        # remove edges
+        for j, _ in list(self.get_edges(item_index)):
+            self._remove_edge(item_index, j)
+        # remove from interests
+        with self._flush_lock:
+            self.interests.remove(item_index)
+        self._auto_compact()
+        
+    def _auto_compact(self) -> bool:
+        """Compacts the SearchGraph after a removal once the ratio of 
+        removed indices passes COMPACT_RATIO. Returns True if the 
+        SearchGraph was compacted."""
+        return self.compact(COMPACT_RATIO)
+        
+    def compact(self, min_ratio: float=0.0) -> bool:
+        """Renumbers the SearchItem indices to reclaim removed indices.
+        
+        Args:
+            min_ratio: An (optional) float ratio of removed indices
+                required to run the compaction. Defaults to 0.0.
+                
+        Returns:
+            A bool, True if the SearchGraph was compacted.
+        """
+        if not self.removed or \
+                len(self.removed) / len(self.items) < min_ratio:
+            return False
+        # apply buffered events before indices change
+        self.flush_interests()
+        # map old indices to new indices
+        mapping: list[int] = []
+        live = []
+        for i in range(len(self.items)):
+            if i in self.removed:
+                mapping.append(None)
+            else:
+                mapping.append(len(live))
+                live.append(i)
+        # renumber graph
+        if isinstance(self.graph, SparseAdjacency):
+            self.graph.renumber(mapping)
+        else:
+            self.graph = [[self.graph[i][j] for j in live] for i in live]
+        self.items = [self.items[i] for i in live]
+        self.item_dict = {name: mapping[i] 
+                          for name, i in self.item_dict.items()}
+        self.tag_item = [{mapping[i] for i in item_indices}
+                         for item_indices in self.tag_item]
+        interests = TrendingIndex(self.interests.capacity)
+        for i, item in enumerate(self.items):
+            interests.update(i, self._interest(item))
+        with self._flush_lock:
+            self.interests = interests
+        self.removed.clear()
+        return True
+    
+    def _is_frozen(self, caller: str) -> bool:
+        """Returns True and reports the aborted caller if the WordTrie is
+        frozen, which rejects adding or removing SearchItems. 
+        False otherwise."""
+        if not self.words.frozen:
+            return False
+        print(f'[ABORTED] {caller}(): WordTrie is frozen.')
+        return True
     
     def random_item(self) -> SearchItem:
         """Returns a random item from the graph."""
-        return random.choice(self.items)
+        return self.items[random.choice(list(self.item_dict.values()))]
 
-    def _add_tags(self, item: SearchItem) -> None:
+    def _add_tags(self, *items: SearchItem) -> None:
         """Adds to internally-stored tags data."""
-        wtf_name = wordtrie_format(item.get_name())
-        item_index = self.item_dict[wtf_name]
-        for tag in item.get_tags():
-            tag = wordtrie_format(tag)
-            # instantiate data for new tag
-            if tag not in self.tag_dict:
-                self.words.add_words(tag)
-                # print(self.tag_item, self.tag_interest)
-                # map tag index
-                self.tag_dict[tag] = len(self.tag_interest)
-                # store tag data
-                self.tag_item.append(set())
-                self.tag_interest.append(ItemInterest())
-            # get tag index
-            tag_index = self.tag_dict[tag]
-            # map item index to tag
-            self.tag_item[tag_index].add(item_index)
+        new_tags = []
+        for item in items:
+            wtf_name = wordtrie_format(item.get_name())
+            item_index = self.item_dict[wtf_name]
+            for tag in item.get_tags():
+                tag = wordtrie_format(tag)
+                # instantiate data for new tag
+                if tag not in self.tag_dict:
+                    new_tags.append(tag)
+                    # map tag index
+                    self.tag_dict[tag] = len(self.tag_interest)
+                    # store tag data
+                    self.tag_item.append(set())
+                    self.tag_interest.append(ItemInterest())
+                # get tag index
+                tag_index = self.tag_dict[tag]
+                # map item index to tag
+                self.tag_item[tag_index].add(item_index)
+        self.words.add_words(*new_tags)
             
     def save_instance(self, file_path: str) -> FileIO:
         """Saves the current SearchGraph data as
         a pkl file from a str file path."""
         print('[STATUS] save_instance(): Saving SearchGraph data.')
-        attrs = vars(self)
+        self.flush_interests()
+        attrs = self.__getstate__()
         with open(file_path, 'wb') as f:
             pickle.dump(attrs, f)
         print(f'[STATUS] save_instance(): '
               f'Saved SearchGraph data in {file_path}.')
             
+    def to_sparse(self) -> SparseAdjacency:
+        """Returns the edges as a compressed SparseAdjacency. The dense 
+        matrix is converted, the sparse backend is compressed in-place."""
+        if isinstance(self.graph, SparseAdjacency):
+            self.graph.compress()
+            return self.graph
+        graph = SparseAdjacency()
+        for i in range(len(self.graph)):
+            graph.add_node((j, weight) for j, weight in self.get_edges(i) 
+                           if j < i)
+        graph.compress()
+        return graph
+    
+    def save_snapshot(self, file_path: str) -> FileIO:
+        """Saves the current SearchGraph data as a versioned binary 
+        snapshot from a str file path.
+        
+        Edges are stored as flat compressed sparse row arrays, with item 
+        metadata, the tag index and the WordTrie in separate sections.
+        A dense SearchGraph is loaded back with the sparse backend.
+        """
+        print('[STATUS] save_snapshot(): Saving SearchGraph snapshot.')
+        self.flush_interests()
+        graph = self.to_sparse()
+        attrs = self.__getstate__()
+        del attrs['graph']
+        items = {name: attrs.pop(name) 
+                 for name in ('items', 'item_dict', 'removed')}
+        tags = {name: attrs.pop(name) 
+                for name in ('tag_dict', 'tag_interest', 'tag_item')}
+        words = attrs.pop('words')
+        write_snapshot(file_path, {
+            'offsets': graph.offsets,
+            'indices': graph.indices,
+            'weights': graph.weights,
+            'items': pickle.dumps(items),
+            'tags': pickle.dumps(tags),
+            'trie': pickle.dumps(words),
+            'attrs': pickle.dumps(attrs),
+        })
+        print(f'[STATUS] save_snapshot(): '
+              f'Saved SearchGraph snapshot in {file_path}.')
+        
+    def load_snapshot(self, file_path: str) -> None:
+        """Reads from a file generated by save_snapshot() to load the
+        data of a previous SearchGraph. The edge arrays are memory-mapped
+        and used without copying."""
+        t0 = time()
+        print(f'[STATUS] load_snapshot(): '
+              f'Loading SearchGraph snapshot from {file_path}.')
+        try:
+            sections = read_snapshot(file_path)
+        except (OSError, ValueError) as e:
+            print(f'[ERROR] load_snapshot(): {e}')
+            return
+        self.graph = SparseAdjacency(sections['offsets'].cast('q'),
+                                     sections['indices'].cast('i'),
+                                     sections['weights'].cast('d'))
+        for section in ('items', 'tags', 'attrs'):
+            for name, attr in pickle.loads(sections[section]).items():
+                setattr(self, name, attr)
+        self.words = pickle.loads(sections['trie'])
+        print(f'[STATUS] load_snapshot(): '
+              f'Loaded {len(self)} items and {len(self.graph.weights)} '
+              f'edge entries.\n'
+              f'   > Finished in {time()-t0} seconds.')
+            
     def load_instance(self, file_path: str) -> None:
-        """Reads from a file generated by save_graph() to
-        load the data of a previous SearchGraph."""
+        """Reads from a file generated by save_graph() or save_snapshot()
+        to load the data of a previous SearchGraph."""
+        if is_snapshot(file_path):
+            self.load_snapshot(file_path)
+            return
         try:
             print(f'[STATUS] load_instance(): '
                   f'Loading SearchGraph data from {file_path}.')
@@ -268,6 +851,10 @@ class SearchGraph:
                 attrs: dict[str, Any] = pickle.load(f)
             for name, attr in attrs.items():
                 setattr(self, name, attr)
+            # rebuild interests saved as a MinHeap
+            if not isinstance(self.interests, TrendingIndex):
+                self.interests = TrendingIndex()
+                self.update_all_interests()
         except:
             print(f'[ERROR] load_instance(): '
                   f'unable to read {file_path}.')
\ No newline at end of file
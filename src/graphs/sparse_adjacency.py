@@ -0,0 +1,203 @@
+"""This file contains SparseAdjacency, a compressed sparse row (CSR)
+adjacency structure used as a memory-efficient SearchGraph backend.
+"""
+from array import array
+from typing import Iterable, Iterator
+
+
+# minimum number of pending edges before rows are compressed
+COMPRESS_MIN = 4096
+
+
+class SparseAdjacency:
+    """An undirected, weighted adjacency structure stored in compressed
+    sparse row format using flat array buffers.
+
+    Row i's neighbors are stored in indices[offsets[i]:offsets[i+1]] with
+    matching edge weights in weights[offsets[i]:offsets[i+1]]. Rows that
+    were added or modified since the last compression are kept in a small
+    pending dict and merged back into the flat buffers by compress().
+
+    Attributes:
+        offsets: An array of int row offsets into indices and weights.
+        indices: An array of int neighbor indices.
+        weights: An array of float edge weights.
+        pending: A dict mapping modified row indices to a dict of
+            neighbor indices and edge weights.
+        size: An int number of rows.
+    """
+    def __init__(self,
+                 offsets: Iterable[int]=None,
+                 indices: Iterable[int]=None,
+                 weights: Iterable[float]=None) -> None:
+        """Constructs a SparseAdjacency object.
+
+        Args:
+            offsets: An (optional) sequence of int row offsets.
+                Defaults to no rows.
+            indices: An (optional) sequence of int neighbor indices.
+                Defaults to no edges.
+            weights: An (optional) sequence of float edge weights.
+                Defaults to no edges.
+
+        Returns:
+            None.
+        """
+        self.offsets = array('q', [0]) if offsets is None else offsets
+        self.indices = array('i') if indices is None else indices
+        self.weights = array('d') if weights is None else weights
+        self.pending: dict[int, dict[int, float]] = {}
+        self.pending_count = 0 # number of edges stored in pending rows
+        self.size = len(self.offsets) - 1
+
+    def __len__(self) -> int:
+        """Returns the int number of rows."""
+        return self.size
+
+    def __getstate__(self) -> dict:
+        """Returns the attributes to pickle, copying buffers that are
+        memory-mapped, e.g. by SearchGraph.load_snapshot(), into arrays."""
+        state = dict(vars(self))
+        for name, typecode in (('offsets', 'q'), ('indices', 'i'),
+                               ('weights', 'd')):
+            if not isinstance(state[name], array):
+                state[name] = array(typecode, state[name])
+        return state
+
+    def neighbors(self, row: int) -> Iterator[tuple[int, float]]:
+        """Returns an iterator over the neighbors of a given row.
+
+        Args:
+            row: An int row index.
+
+        Returns:
+            An iterator containing a tuple of neighbor index and edge weight.
+        """
+        edges = self.pending.get(row)
+        if edges is not None:
+            return iter(edges.items())
+        lo, hi = self.offsets[row], self.offsets[row+1]
+        return zip(self.indices[lo:hi], self.weights[lo:hi])
+
+    def degree(self, row: int) -> int:
+        """Returns the int number of edges of a given row."""
+        edges = self.pending.get(row)
+        if edges is not None:
+            return len(edges)
+        return self.offsets[row+1] - self.offsets[row]
+
+    def get_weight(self, row: int, col: int) -> float:
+        """Returns the float edge weight between two rows,
+        None if the edge does not exist."""
+        for i, weight in self.neighbors(row):
+            if i == col:
+                return weight
+        return None
+
+    def add_node(self, edges: Iterable[tuple[int, float]]=()) -> int:
+        """Adds a new row connected by the given undirected edges.
+
+        Args:
+            edges: An (optional) iterable of tuples of existing row index
+                and float edge weight. Defaults to no edges.
+
+        Returns:
+            The int index of the new row.
+        """
+        row = self.size
+        self.size += 1
+        new_edges = {}
+        self.pending[row] = new_edges
+        for col, weight in edges:
+            new_edges[col] = weight
+            self._pending_row(col)[row] = weight
+        self.pending_count += 2 * len(new_edges)
+        self._maybe_compress()
+        return row
+
+    def set_edge(self, row: int, col: int, weight: float) -> None:
+        """Sets the undirected edge weight between two rows."""
+        for a, b in ((row, col), (col, row)):
+            edges = self._pending_row(a)
+            if b not in edges:
+                self.pending_count += 1
+            edges[b] = weight
+        self._maybe_compress()
+
+    def remove_edge(self, row: int, col: int) -> None:
+        """Removes the undirected edge between two rows if it exists."""
+        for a, b in ((row, col), (col, row)):
+            if self._pending_row(a).pop(b, None) is not None:
+                self.pending_count -= 1
+
+    def compress(self) -> None:
+        """Merges all pending rows into the flat CSR buffers."""
+        if not self.pending:
+            return
+        offsets = array('q', [0])
+        indices = array('i')
+        weights = array('d')
+        for row in range(self.size):
+            edges = self.pending.get(row)
+            if edges is None:
+                lo, hi = self.offsets[row], self.offsets[row+1]
+                indices.extend(self.indices[lo:hi])
+                weights.extend(self.weights[lo:hi])
+            else:
+                cols = sorted(edges)
+                indices.extend(cols)
+                weights.extend([edges[col] for col in cols])
+            offsets.append(len(indices))
+        self.offsets, self.indices, self.weights = offsets, indices, weights
+        self.pending.clear()
+        self.pending_count = 0
+
+    def renumber(self, mapping: list[int]) -> None:
+        """Renumbers all rows and compresses them into new buffers.
+
+        Args:
+            mapping: A list mapping each old row index to its new row index,
+                or None to drop the row. New indices must keep the order
+                of the old indices.
+
+        Returns:
+            None.
+        """
+        offsets = array('q', [0])
+        indices = array('i')
+        weights = array('d')
+        for row, new_row in enumerate(mapping):
+            if new_row is None:
+                continue
+            edges = sorted((mapping[col], weight)
+                           for col, weight in self.neighbors(row)
+                           if mapping[col] is not None)
+            indices.extend([col for col, _ in edges])
+            weights.extend([weight for _, weight in edges])
+            offsets.append(len(indices))
+        self.offsets, self.indices, self.weights = offsets, indices, weights
+        self.pending.clear()
+        self.pending_count = 0
+        self.size = len(offsets) - 1
+
+    def nbytes(self) -> int:
+        """Returns the approximate int number of bytes used by the
+        compressed buffers, excluding pending rows."""
+        return sum(len(buf) * buf.itemsize
+                   for buf in (self.offsets, self.indices, self.weights))
+
+    def _pending_row(self, row: int) -> dict[int, float]:
+        """Returns the pending edges of a row, copying the row
+        out of the compressed buffers if necessary."""
+        edges = self.pending.get(row)
+        if edges is None:
+            lo, hi = self.offsets[row], self.offsets[row+1]
+            edges = dict(zip(self.indices[lo:hi], self.weights[lo:hi]))
+            self.pending[row] = edges
+            self.pending_count += len(edges)
+        return edges
+
+    def _maybe_compress(self) -> None:
+        """Compresses pending rows once they outgrow the flat buffers."""
+        if self.pending_count > max(COMPRESS_MIN, len(self.weights) // 2):
+            self.compress()
@@ -18,22 +18,23 @@ Example Usage:
     ]
     heap = MinHeap(data)
 """
-from copy import deepcopy
+from heapq import heappop, heappush # frontier for ordered iteration
+from itertools import islice
 from typing import Any, Hashable, Iterator
 
 
-from src.minimum_heap.priority_node import PriorityNode
-
-
 class MinHeap:
     """This class provides a min heap data structure with the ability
-    to change item priorities. It uses the PriorityNode class to store
-    node information.
+    to change item priorities. Items and priorities are stored in
+    parallel lists, and every item's position in them is indexed.
     
     Attributes:
-        items: A list of PriorityNodes, heapified.
+        items: A list of items, heapified by priorities.
+        priorities: A list of float priorities of items at the same index.
         item_dict: A dict with any item as keys, and int indices as values.
     """
+    __slots__ = ('items', 'priorities', 'item_dict')
+    
     def __init__(self, data: list[tuple[Hashable, float]]=[]) -> None:
         """Constructs a MinHeap object.
         
@@ -45,24 +46,48 @@ class MinHeap:
         Returns:
             None.
         """
-        # stores all items with heap invariance as PriorityNodes
-        self.items: list[PriorityNode] = [] 
+        # stores all items with heap invariance
+        self.items: list[Hashable] = []
+        self.priorities: list[float] = []
         # maps item to index in self.items
         self.item_dict: dict[Hashable, int] = {}
         self._construct_heap(data)
     
     def _construct_heap(self, data: list[tuple[Hashable, float]]) -> None:
-        """Heapifies a list from the given args in-place.
+        """Heapifies a list from the given args in O(n) time.
         
         Args:
             data: A list of items to be heapified. Must be in the following format:
                 data = [ (item0, priority0), (item1, priority1), ... ]
         
         Returns:
-            None, transforms the given list in-place.
+            None.
         """
         for item, priority in data:
-            self.add(item, priority)
+            if item in self.item_dict:
+                print('Item already exists in heap.')
+            self.item_dict[item] = len(self.items)
+            self.items.append(item)
+            self.priorities.append(priority)
+        # sift down every parent, starting from the last one
+        for index in range(len(self.items) // 2 - 1, -1, -1):
+            self._percolate_down(index)
+    
+    def __getstate__(self) -> dict[str, Any]:
+        """Returns the pickled state of the MinHeap."""
+        return {'items': self.items, 'priorities': self.priorities,
+                'item_dict': self.item_dict}
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores a pickled MinHeap, including MinHeaps pickled with
+        a list of PriorityNodes."""
+        if 'priorities' not in state:
+            nodes = state['items']
+            state = {'items': [node.get_item() for node in nodes],
+                     'priorities': [node.get_priority() for node in nodes],
+                     'item_dict': state['item_dict']}
+        for name, attr in state.items():
+            setattr(self, name, attr)
             
     def __contains__(self, item: Hashable) -> bool:
         """Checks if an item is in the heap.
@@ -73,48 +98,62 @@ class MinHeap:
         Returns:
             A bool.
         """
-        return self.contains(item)
+        return item in self.item_dict
     
     def __len__(self) -> int:
         """Returns an int size of the MinHeap."""
-        return self.size()
+        return len(self.items)
     
     def __iter__(self) -> Iterator[Any]:
         """Returns an iterator over the items stored in the MinHeap.
         Items will be returned in sorted order.
         
-        Args:
-            show_weight: A bool selector for returning weight as well.
+        The heap is not modified or copied. Items are found lazily by
+        walking the heap with a small frontier heap of candidate indices,
+        so the first k items take O(k log k) time. The MinHeap must not
+        be modified during iteration.
         
         Returns:
-            An iterator with any item. If show_weight is True, returns
-            an iterator with a tuple of any item, and its weight.
+            An iterator with any item.
         """
-        heap_copy = deepcopy(self)
-        while len(heap_copy) > 0:
-            yield heap_copy.pop()
-    
-    def __repr__(self) -> str:
-        """Returns a str representation of MinHeap."""
-        return str(self.items)
+        for index in self._iter_indices():
+            yield self.items[index]
             
-    def _swap(self, a: int, b: int) -> None:
-        """Swaps two items at two indices.
+    def _iter_indices(self) -> Iterator[int]:
+        """Returns an iterator over the heap indices in priority order.
         
-        Args:
-            a: The first item's index.
-            b: The second item's index.
+        The children of a node can only follow the node itself, so the
+        frontier starts at the root and each yielded index adds its 
+        children as candidates.
+        """
+        priorities = self.priorities
+        size = len(priorities)
+        if not size:
+            return
+        frontier = [(priorities[0], 0)]
+        while frontier:
+            _, index = heappop(frontier)
+            yield index
+            for child in (index * 2 + 1, index * 2 + 2):
+                if child < size:
+                    heappush(frontier, (priorities[child], child))
+    
+    def nsmallest(self, k: int) -> list[Any]:
+        """Returns a list of the k smallest-priority items in sorted order
+        without modifying the heap.
         
+        Args:
+            k: An int number of items.
+            
         Returns:
-            None.
+            A list of up to k items.
         """
-        # swap items in list
-        item_a, item_b = self.items[a], self.items[b]
-        self.items[a], self.items[b] = item_b, item_a
-        # update respective indicies
-        self.item_dict[item_a.get_item()] = b
-        self.item_dict[item_b.get_item()] = a
-        
+        return list(islice(self, k))
+    
+    def __repr__(self) -> str:
+        """Returns a str representation of MinHeap."""
+        return str(self.items)
+            
     def add(self, item: Hashable, priority: float) -> None:
         """Pushes an item onto the heap, maintains heap invariance.
         
@@ -128,10 +167,11 @@ class MinHeap:
         if item in self.item_dict:
             print('Item already exists in heap.')
         # append item to end of heap
-        self.items.append(PriorityNode(item, priority))
-        self.item_dict[item] = len(self.items) - 1
+        self.item_dict[item] = len(self.items)
+        self.items.append(item)
+        self.priorities.append(priority)
         # percolate up to maintain heap invariance
-        self._percolate_up(self.item_dict[item])
+        self._percolate_up(len(self.items) - 1)
         
     def contains(self, item: Hashable) -> bool:
         """Checks if an item is in the heap.
@@ -158,7 +198,7 @@ class MinHeap:
         # check if heap is empty
         if not len(self.items):
             return None
-        return self.items[0].get_item()
+        return self.items[0]
 
     def pop(self, item: Hashable=None) -> Hashable:
         """Pops the an item from the heap, maintains heap invariance.
@@ -176,20 +216,8 @@ class MinHeap:
         # check for edge cases
         if not len(self.items) or item is not None and item not in self.item_dict:
             return None
-        if len(self.items) == 1:
-            self.item_dict.clear()
-            return self.items.pop().get_item()
-        # swap with last item
-        if not item:
-            swap_index = 0
-        else:
-            swap_index = self.item_dict[item]
-        self._swap(swap_index, len(self.items)-1)
-        popped_item = self.items.pop().get_item()
-        # update self.item_dict and percolate down
-        self.item_dict.pop(popped_item)
-        self._percolate_down(swap_index)
-        return popped_item
+        index = 0 if item is None else self.item_dict[item]
+        return self._remove(index)[0]
     
     def _pop_items(self) -> tuple[Hashable, float]:
         """Pops the smallest-priority item and its priority from 
@@ -204,20 +232,31 @@ class MinHeap:
             A tuple of the smallest-priority item stored
             at the heap and its priority.
         """
-        # check for edge cases
         if not len(self.items):
             return None
-        if len(self.items) == 1:
-            self.item_dict.clear()
-            item = self.items.pop()
-            return item.get_item(), item.get_priority()
-        # swap with last it
-        self._swap(0, len(self.items) - 1)
-        item = self.items.pop()
-        # update self.item_dict and percolate down
-        self.item_dict.pop(item.get_item())
-        self._percolate_down(0)
-        return item.get_item(), item.get_priority()
+        return self._remove(0)
+    
+    def _remove(self, index: int) -> tuple[Hashable, float]:
+        """Removes the item at a heap index, maintains heap invariance.
+        
+        Args:
+            index: An int index of the item to remove.
+            
+        Returns:
+            A tuple of the removed item and its priority.
+        """
+        items, priorities = self.items, self.priorities
+        item, priority = items[index], priorities[index]
+        del self.item_dict[item]
+        # move the last item into the freed index
+        last_item, last_priority = items.pop(), priorities.pop()
+        if index < len(items):
+            items[index] = last_item
+            priorities[index] = last_priority
+            self.item_dict[last_item] = index
+            self._percolate_up(index)
+            self._percolate_down(self.item_dict[last_item])
+        return item, priority
         
     def change_priority(self, item: Hashable, priority: float) -> None:
         """Changes the priority of an item, maintains heap invariance.
@@ -232,9 +271,10 @@ class MinHeap:
         if item not in self.item_dict:
             print('Given item does not exist.')
             return
-        self.items[self.item_dict[item]].set_priority(priority)
+        index = self.item_dict[item]
+        self.priorities[index] = priority
         # percolate to maintain heap invariance
-        self._percolate_up(self.item_dict[item])
+        self._percolate_up(index)
         self._percolate_down(self.item_dict[item])
         
     def size(self) -> int:
@@ -266,6 +306,9 @@ class MinHeap:
 
     def _percolate_up(self, curr_index: int) -> None:
         """Percolates a node up to maintain the heap invariance.
+        
+        The node is held aside while larger parents are shifted down,
+        and is written once at its final index.
 
         Args:
             curr_index: An int index of the element to be percolated up.
@@ -273,23 +316,28 @@ class MinHeap:
         Returns:
             None.
         """
-        while True:
-            if not curr_index:
-                return
-            # calculate index & get priorities
+        items, priorities, item_dict = self.items, self.priorities, self.item_dict
+        item, priority = items[curr_index], priorities[curr_index]
+        while curr_index:
             pare_index = (curr_index - 1) // 2
-            curr_priority = self.items[curr_index].get_priority()
-            pare_priority = self.items[pare_index].get_priority()
-            # swap with parent if parent is larger
-            if curr_priority < pare_priority:
-                self._swap(curr_index, pare_index)
-                curr_index = pare_index
-                continue
-            # break when parent is smaller
-            break
+            # stop when parent is smaller or equal
+            if not priority < priorities[pare_index]:
+                break
+            # shift parent down
+            pare_item = items[pare_index]
+            items[curr_index] = pare_item
+            priorities[curr_index] = priorities[pare_index]
+            item_dict[pare_item] = curr_index
+            curr_index = pare_index
+        items[curr_index] = item
+        priorities[curr_index] = priority
+        item_dict[item] = curr_index
 
     def _percolate_down(self, curr_index: int) -> None:
         """Percolates a node down to maintain the heap invariance.
+        
+        The node is held aside while smaller children are shifted up,
+        and is written once at its final index.
 
         Args:
             curr_index: An int index of the element to be percolated down.
@@ -297,26 +345,27 @@ class MinHeap:
         Returns:
             None.
         """
-        # child indices
-        left_index = curr_index * 2 + 1
-        right_index = curr_index * 2 + 2
-        # check if both children exists
-        if right_index < len(self.items):
-            if self.items[left_index].get_priority() < self.items[right_index].get_priority():
-                child_priority = self.items[left_index].get_priority()
-                child_index = left_index
-            else:
-                child_priority = self.items[right_index].get_priority()
+        items, priorities, item_dict = self.items, self.priorities, self.item_dict
+        size = len(items)
+        item, priority = items[curr_index], priorities[curr_index]
+        while True:
+            child_index = curr_index * 2 + 1
+            if child_index >= size:
+                break
+            # pick the smaller child
+            right_index = child_index + 1
+            if right_index < size and \
+                    not priorities[child_index] < priorities[right_index]:
                 child_index = right_index
-        # check if left child exists
-        elif left_index < len(self.items):
-            child_priority = self.items[left_index].get_priority()
-            child_index = left_index
-        # no children
-        else:
-            return
-        # swap if child is smaller
-        curr_priority = self.items[curr_index].get_priority()
-        if child_priority < curr_priority:
-            self._swap(curr_index, child_index)
-            self._percolate_down(child_index)
+            # stop when child is larger or equal
+            if not priorities[child_index] < priority:
+                break
+            # shift child up
+            child_item = items[child_index]
+            items[curr_index] = child_item
+            priorities[curr_index] = priorities[child_index]
+            item_dict[child_item] = curr_index
+            curr_index = child_index
+        items[curr_index] = item
+        priorities[curr_index] = priority
+        item_dict[item] = curr_index
@@ -0,0 +1,201 @@
+"""This file contains RecommendStore, a single-file memory-mapped store
+of precomputed recommendations.
+
+File layout (native byte order):
+    header: 8-byte magic, uint16 version, uint16 flags, uint64 size,
+        uint32 k, 4 padding bytes
+    indices: int32 matrix of size x k recommended item indices,
+        padded with -1. Rows that were never set start with -2.
+    distances: (optional) float32 matrix of size x k distances,
+        padded with inf
+"""
+from __future__ import annotations
+from array import array
+import mmap
+import os
+import struct
+from typing import Iterable
+
+
+MAGIC = b'SGRECS\x00\x00'
+VERSION = 2
+HAS_DISTANCES = 1 # header flag
+UNSET = -2 # first index of rows that were never set
+HEADER = struct.Struct('=8sHHQI4x')
+
+
+class RecommendStore:
+    """This class provides O(1) lookups of precomputed recommendations
+    stored as fixed-width rows in a memory-mapped file.
+
+    Attributes:
+        file_path: A str file path of the store.
+        size: An int number of rows, one per item index.
+        k: An int number of recommendations per row.
+        has_distances: A bool to determine if distances are stored.
+        writable: A bool to determine if rows can be set.
+    """
+    def __init__(self, file_path: str, writable: bool=False) -> None:
+        """Opens a RecommendStore from a file generated by create().
+
+        Args:
+            file_path: A str file path of the store.
+            writable: An (optional) bool to open the store for set().
+                Defaults to False.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: If the file header is not a valid store header.
+        """
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with open(file_path, 'r+b' if writable else 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=access)
+        self._view = view = memoryview(self._mmap)
+        magic, version, flags, size, k = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{file_path} is not a version {VERSION} '
+                             'recommendation store.')
+        self.size = size
+        self.k = k
+        self.has_distances = bool(flags & HAS_DISTANCES)
+        if len(view) != _file_size(size, k, self.has_distances):
+            raise ValueError(f'{file_path} is truncated.')
+        self.file_path = file_path
+        self.writable = writable
+        end = HEADER.size + 4 * size * k
+        self._indices = view[HEADER.size:end].cast('i')
+        self._distances = None
+        if self.has_distances:
+            self._distances = view[end:end + 4 * size * k].cast('f')
+
+    @classmethod
+    def create(cls,
+               file_path: str,
+               size: int,
+               k: int,
+               distances: bool=True) -> RecommendStore:
+        """Creates a store file of unset rows and opens it for writing.
+
+        Args:
+            file_path: A str file path to create the store at.
+            size: An int number of rows, one per item index.
+            k: An int number of recommendations per row.
+            distances: An (optional) bool to store distances as well.
+                Defaults to True.
+
+        Returns:
+            A writable RecommendStore.
+        """
+        flags = HAS_DISTANCES if distances else 0
+        unset_row = array('i', [UNSET] + [-1] * (k - 1))
+        inf_row = array('f', [float('inf')]) * k
+        # replace the file atomically, existing maps keep the old file
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, size, k))
+            for _ in range(size):
+                f.write(unset_row)
+            if distances:
+                for _ in range(size):
+                    f.write(inf_row)
+        os.replace(tmp_path, file_path)
+        return cls(file_path, writable=True)
+
+    def __len__(self) -> int:
+        """Returns the int number of rows."""
+        return self.size
+
+    def is_set(self, item_index: int) -> bool:
+        """Returns True if the row of an item index was set,
+        False otherwise."""
+        return self._indices[item_index * self.k] != UNSET
+
+    def indices(self, item_index: int, limit: int=None) -> memoryview:
+        """Returns a memoryview of up to limit recommended item indices
+        of an item index, padded with -1."""
+        return self._indices[self._row(item_index, limit)]
+
+    def distances(self, item_index: int, limit: int=None) -> memoryview:
+        """Returns a memoryview of up to limit distances of an
+        item index, None if the store has no distances."""
+        if self._distances is None:
+            return None
+        return self._distances[self._row(item_index, limit)]
+
+    def kth_distances(self) -> memoryview:
+        """Returns a memoryview of the last distance of every row, inf for
+        unset rows and rows with fewer than k recommendations. None if the 
+        store has no distances."""
+        if self._distances is None:
+            return None
+        return self._distances[self.k-1::self.k]
+
+    def _row(self, item_index: int, limit: int=None) -> slice:
+        """Returns a slice of up to limit entries of an item index row."""
+        start = item_index * self.k
+        count = self.k if limit is None else min(limit, self.k)
+        return slice(start, start + count)
+
+    def set(self, item_index: int,
+            nearest: Iterable[tuple[int, float]]) -> None:
+        """Stores up to k (index, distance) recommendations of an item index.
+
+        Args:
+            item_index: An int item index.
+            nearest: An iterable of tuples of recommended item index and
+                distance, sorted by distance.
+
+        Returns:
+            None.
+        """
+        nearest = list(nearest)[:self.k]
+        padding = self.k - len(nearest)
+        start = item_index * self.k
+        self._indices[start:start + self.k] = \
+            array('i', [i for i, _ in nearest] + [-1] * padding)
+        if self._distances is not None:
+            self._distances[start:start + self.k] = \
+                array('f', [d for _, d in nearest] + [float('inf')] * padding)
+
+    def extend(self, size: int) -> RecommendStore:
+        """Creates a larger copy of the store with unset rows appended.
+
+        The copy atomically replaces the file, this store keeps mapping
+        the old file until it is closed.
+
+        Args:
+            size: An int number of rows of the new store.
+
+        Returns:
+            A writable RecommendStore of the given size.
+        """
+        tmp_path = self.file_path + '.new'
+        store = RecommendStore.create(tmp_path, size, self.k,
+                                      self.has_distances)
+        count = min(self.size, size) * self.k
+        store._indices[:count] = self._indices[:count]
+        if self._distances is not None:
+            store._distances[:count] = self._distances[:count]
+        store.flush()
+        os.replace(tmp_path, self.file_path)
+        store.file_path = self.file_path
+        return store
+
+    def flush(self) -> None:
+        """Flushes written rows to the file."""
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """Closes the memory map of the store."""
+        self._indices.release()
+        if self._distances is not None:
+            self._distances.release()
+        self._view.release()
+        self._mmap.close()
+
+
+def _file_size(size: int, k: int, distances: bool) -> int:
+    """Returns the int byte size of a store file."""
+    return HEADER.size + 4 * size * k * (2 if distances else 1)
@@ -1,51 +1,97 @@
 """This file contains SearchEngine, a class that implements graph algorithms
 to perform search engine functionalities.
 """
-import os # file io
-import pickle # file io
+import asyncio # background refresh
 from multiprocessing import Pool, cpu_count
 from io import FileIO
 from time import time
+from typing import Any, Iterable
+from array import array
+import json # checkpoint manifest
+import os # file io
 
 
 from src.minimum_heap.min_heap import MinHeap
+from src.graphs.graph_snapshot import read_snapshot, write_snapshot
 from src.graphs.search_graph import SearchGraph
 from src.graphs.search_item import SearchItem
-from src.graphs.search_algorithms import dijkstra
+from src.graphs.sparse_adjacency import SparseAdjacency
+from src.search_engine.recommend_store import RecommendStore
+from src.graphs.search_algorithms import TOP_K_ALGORITHMS, HAS_CSGRAPH
+from src.graphs.search_algorithms import SHORTEST_PATH_ALGORITHMS, batch_top_k
+from src.graphs.search_algorithms import lazy_dijkstra
 from src.utils.formatting import wordtrie_format
 from src.utils.similarities import name_similarity
 
 
+# number of precomputed recommendations per item
+RECOMMEND_LIMIT = 100
+
+
 class SearchEngine(SearchGraph):
     """Uses graph algorithms on SearchGraph to implement a search engine.
     
     SearchEngine inherits SearchGraph.
     
     Attributes:
-        graph: An adjacency matrix implemented using 2-dimensional lists.
+        graph: An adjacency matrix implemented using 2-dimensional lists,
+            or a SparseAdjacency if the sparse backend is selected.
         items: A list of SearchItems.
         words: A WordTrie containing all the SearchItem names.
         size: The active size of the adjacency matrix.
     """
-    def __init__(self, init_file: str=None, precomputed_path: str=None) -> None:
+    def __init__(self, 
+                 init_file: str=None, 
+                 precomputed_path: str=None,
+                 sparse: bool=False,
+                 max_degree: int=None,
+                 algorithm: str='dijkstra',
+                 half_life: float=None) -> None:
         """Constructs a SearchEngine.
         
         Args:
             init_file: A str filepath to init a SearchGraph from. This file 
                 should be a file generated by SearchGraph's save_instance().
-            precomputed_path: A str path to a directory of precomputed 
-                recommendations.
+            precomputed_path: A str path to a RecommendStore file of 
+                precomputed recommendations.
+            sparse: An (optional) bool to use the compressed sparse row
+                graph backend. Defaults to False.
+            max_degree: An (optional) int maximum number of edges per 
+                SearchItem. Defaults to no limit.
+            algorithm: An (optional) str name of the ranking function
+                used for recommendations, one of TOP_K_ALGORITHMS, e.g.
+                'lazy_dijkstra' or 'personalized_pagerank'. 
+                'personalized_pagerank' always uses the sparse backend,
+                since its work is only bounded on sparse rows.
+                Defaults to 'dijkstra'.
+            half_life: An (optional) float number of seconds for interests
+                to halve, used by trending(). Defaults to all-time interest.
         Returns:
             None.
         """
-        super().__init__(init_file)
+        super().__init__(init_file, sparse, max_degree, half_life)
+        self.algorithm = algorithm
+        # pushes must not scan dense rows, see personalized_pagerank()
+        if algorithm == 'personalized_pagerank' and \
+                not isinstance(self.graph, SparseAdjacency):
+            self.graph = self.to_sparse()
         if precomputed_path:
-            if len(os.listdir(precomputed_path)) >= len(self.items):
-                self.pc_path = precomputed_path
-            else:
+            self.pc_path = precomputed_path
+            if self._get_store() is None:
                 print('[ERROR] SearchEngine(): '
                     'Please use the correct precomputed path or generate '
                     'a new one using save_all_recommends().')
+                
+    def _init_runtime(self) -> None:
+        """Sets the private runtime attributes, which are not pickled,
+        see SearchGraph._init_runtime()."""
+        super()._init_runtime()
+        self._store: RecommendStore = None # opened precomputed store
+        # precomputed recommendations invalidated by edge changes
+        self._changed: set[int] = set() # item indices with changed edges
+        self._stale: set[int] = set() # item indices to recompute
+        self._new_rows: dict[int, list[tuple[int, float]]] = {}
+        self._refresh_task: asyncio.Task = None
             
     async def search(self, query: str, 
                      limit: int=100) -> list[SearchItem]:
@@ -94,69 +140,289 @@ class SearchEngine(SearchGraph):
         Returns: 
             A list of recommended SearchItems.
         """
-        query = wordtrie_format(query)
-        query = self.words.word_suggestions(query)
-        if not query:
+        item_index = self._resolve_item(query)
+        if item_index is None:
             return []
-        item_index = self.item_dict[query[0]]
         # update appearance count
         self.add_appearance(item_index)
         results = self._recommend(item_index, limit)
-        return self._extend_results(results, item_index, limit)
+        return self._extend_results(list(results), item_index, limit, results)
+            
+    async def recommend_many(self, queries: list[str], 
+                             limit: int=100) -> list[list[SearchItem]]:
+        """An awaitable function, returns a list of recommended SearchItems
+        for each of the given search queries.
+        
+        Queries resolving to the same SearchItem share one set of 
+        recommendations, computed once per distinct SearchItem and reused
+        to extend the results. Traversals are only shared across 
+        SearchItems by the scipy batch path, see _recommend_many().
+        
+        Args:
+            queries: A list of str queries to recommend from.
+            limit: An (optional) int results limit per query. 
+                Defaults to 100. 
+        
+        Returns: 
+            A list of lists of recommended SearchItems, 
+            in the order of the given queries.
+        """
+        # resolve each distinct query to an item index once
+        resolved: dict[str, int] = {}
+        for query in queries:
+            if query not in resolved:
+                resolved[query] = self._resolve_item(query)
+        item_indices = {i for i in resolved.values() if i is not None}
+        recommends = self._recommend_many(item_indices, limit)
+        results = []
+        for query in queries:
+            item_index = resolved[query]
+            if item_index is None:
+                results.append([])
+                continue
+            # update appearance count
+            self.add_appearance(item_index)
+            results.append(self._extend_results(list(recommends[item_index]),
+                                                item_index, limit, 
+                                                recommends[item_index]))
+        return results
+    
+    def _resolve_item(self, query: str) -> int:
+        """Returns the item index to recommend from for a str query, the 
+        SearchItem named by the query if it exists, otherwise the 
+        highest-ranked suggested SearchItem. Suggested tags are skipped.
+        None if no SearchItem matches the query."""
+        query = wordtrie_format(query)
+        if query in self.item_dict:
+            return self.item_dict[query]
+        limit = 10
+        while True:
+            names = self.words.word_suggestions(query, limit)
+            for name in names:
+                if name in self.item_dict:
+                    return self.item_dict[name]
+            # all suggestions are tags
+            if len(names) < limit:
+                return None
+            limit *= 2
+    
+    def _recommend_many(self, item_indices: Iterable[int], 
+                        limit: int) -> dict[int, list[int]]:
+        """Returns a dict of recommendations for each item index, up to 
+        limit. Without precomputed recommendations, a sparse graph 
+        computes them together using batch_top_k() if scipy is available.
+        Otherwise the batch is only deduplicated, every item index runs 
+        one _recommend()."""
+        item_indices = list(item_indices)
+        if getattr(self, 'pc_path', None) or not HAS_CSGRAPH or \
+                not isinstance(self.graph, SparseAdjacency) or \
+                self.algorithm not in SHORTEST_PATH_ALGORITHMS:
+            return {i: self._recommend(i, limit) for i in item_indices}
+        return {i: [j for j, _ in nearest] 
+                for i, nearest in batch_top_k(self, item_indices, limit)}
             
     def _recommend(self, item_index: int, limit: int) -> list[int]:
         """Returns recommendations for an item index, up to limit."""
-        # use precomputed paths if available
-        results = []
+        # use precomputed recommendations if available
+        store = self._get_store()
+        if store is not None and item_index < len(store) and \
+                store.is_set(item_index):
+            return [i for i in store.indices(item_index, limit).tolist()
+                    if i >= 0 and i not in self.removed]
+        # run algorithm otherwise, stopping at limit
+        return [i for i, _ in self._nearest(item_index, limit)]
+    
+    def _get_store(self) -> RecommendStore:
+        """Returns the opened precomputed RecommendStore, None if there is
+        no valid store for the current items."""
+        store = getattr(self, '_store', None)
+        if store is not None or not getattr(self, 'pc_path', None):
+            return store
         try:
-            rec_path = os.path.join(self.pc_path, f'{item_index}.pkl')
-            with open(rec_path, 'rb') as f:
-                item_indices = pickle.load(f)
-            for cnt, i in enumerate(item_indices):
-                if cnt > limit:
-                    break
-                if i == item_index:
-                    continue
-                results.append(i)
-        except:   
-            # run algorithm otherwise
-            results_heap = dijkstra(self, item_index)
-            for cnt, i in enumerate(results_heap):
-                if cnt > limit:
-                    break
-                if i == item_index:
-                    continue
-                results.append(i)
-        return results
+            store = RecommendStore(self.pc_path)
+        except (OSError, ValueError) as e:
+            print(f'[ERROR] _get_store(): {e}')
+            self.pc_path = None
+            return None
+        # header check against the current items
+        if len(store) < len(self.items):
+            # newer items are added by refresh_recommends()
+            print(f'[STATUS] _get_store(): {self.pc_path} has '
+                  f'{len(store)} items, refreshing '
+                  f'{len(self.items)-len(store)} newer items.')
+            self._changed.update(range(len(store), len(self.items)))
+        elif len(store) > len(self.items):
+            print(f'[ERROR] _get_store(): {self.pc_path} has '
+                  f'{len(store)} items, expected {len(self.items)}.')
+            store.close()
+            self.pc_path = None
+            return None
+        self._store = store
+        return store
+    
+    def _nearest(self, item_index: int, limit: int) -> list[tuple[int, float]]:
+        """Returns up to limit tuples of nearest SearchItem index and
+        distance using the selected shortest path algorithm."""
+        top_k = TOP_K_ALGORITHMS[self.algorithm]
+        return top_k(self, item_index, limit) or []
+    
+    def _add_edges(self, rows: list[list[tuple[int, float]]]) -> None:
+        """Adds new rows to the adjacency, see SearchGraph._add_edges(),
+        and invalidates the precomputed recommendations they affect."""
+        size = len(self.graph)
+        super()._add_edges(rows)
+        if getattr(self, 'pc_path', None):
+            self._changed.update(range(size, len(self.graph)))
+            self._schedule_refresh()
+            
+    def _remove_edge(self, i: int, j: int) -> None:
+        """Removes the undirected edge between two SearchItem indices and
+        invalidates the precomputed recommendations it affects."""
+        super()._remove_edge(i, j)
+        if getattr(self, 'pc_path', None):
+            self._changed.update((i, j))
+            self._schedule_refresh()
+            
+    def _schedule_refresh(self) -> None:
+        """Starts refresh_recommends() as a background task if an event
+        loop is running and no refresh is in progress."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # no event loop, refresh_recommends() must be awaited instead
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = loop.create_task(self.refresh_recommends())
+    
+    async def refresh_recommends(self) -> int:
+        """An awaitable function to recompute the precomputed 
+        recommendations invalidated since the last refresh.
+        
+        Only sources affected by new or removed edges are recomputed, one 
+        at a time while yielding to the event loop, so stale 
+        recommendations keep being served in the meantime. Rows of new 
+        SearchItems are appended to the store once they are all computed.
+        It is started in the background when edges change inside a 
+        running event loop.
+        
+        Returns:
+            The int number of recomputed sources.
+        """
+        store = self._get_store()
+        refreshed = 0
+        while store is not None and (self._changed or self._stale):
+            store = self._writable_store()
+            if self._changed:
+                changed, self._changed = self._changed, set()
+                self._stale.update(self._affected_sources(store, changed))
+            while self._stale and not self._changed:
+                item_index = self._stale.pop()
+                nearest = self._nearest(item_index, store.k)
+                if item_index < len(store):
+                    store.set(item_index, nearest)
+                else:
+                    self._new_rows[item_index] = nearest
+                refreshed += 1
+                await asyncio.sleep(0)
+                # stop if the store was dropped, e.g. by compact()
+                if self._store is not store:
+                    return refreshed
+            if self._stale or self._changed:
+                continue
+            if self._new_rows:
+                store = store.extend(max(self._new_rows) + 1)
+                for item_index, nearest in self._new_rows.items():
+                    store.set(item_index, nearest)
+                self._new_rows.clear()
+                self._store.close()
+                self._store = store
+            store.flush()
+        return refreshed
+    
+    def _writable_store(self) -> RecommendStore:
+        """Reopens the precomputed RecommendStore for writing."""
+        store = self._get_store()
+        if not store.writable:
+            self._store = RecommendStore(self.pc_path, writable=True)
+            store.close()
+        return self._store
+    
+    def _affected_sources(self, store: RecommendStore,
+                          changed: set[int]) -> set[int]:
+        """Returns the set of item indices whose precomputed 
+        recommendations may be changed by edges of the changed indices.
+        
+        For shortest path algorithms with stored distances, a source is 
+        affected if its distance to a changed index is shorter than its 
+        current k-th distance. This is exact for added edges and an 
+        estimate for removed edges. Otherwise the nearest k items of each
+        changed index are used as an estimate. Unset rows are never
+        affected, since they are computed online by _recommend()."""
+        affected = set(changed)
+        kth = store.kth_distances()
+        if kth is None or self.algorithm not in SHORTEST_PATH_ALGORITHMS:
+            for item_index in changed:
+                affected.update(i for i, _ in self._nearest(item_index, 
+                                                            store.k))
+        else:
+            max_dist = max((dist for i, dist in enumerate(kth) 
+                            if store.is_set(i)), default=0.0)
+            for item_index in changed:
+                for i, dist in lazy_dijkstra(self, item_index, 
+                                             max_dist=max_dist) or []:
+                    if i >= len(store) or dist < kth[i]:
+                        affected.add(i)
+        return {i for i in affected if i >= len(store) or store.is_set(i)}
     
     def latest(self, limit: int=10) -> list[SearchItem]:
         """Returns a list of the newest-added SearchItems."""
         results = []
-        for i in range(len(self)-1, len(self)-limit-1, -1):
-            try:
-                results.append(self.items[i])
-            except:
+        for i in range(len(self.items)-1, -1, -1):
+            if len(results) >= limit:
                 break
+            if i not in self.removed:
+                results.append(self.items[i])
         return results
     
     def trending(self, limit: int=10) -> list[SearchItem]:
-        """Returns a list of the highest-view count SearchItems."""
-        results = []
-        popped = []
-        for _ in range(limit):
-            item_index = self.interests.pop()
-            item = self.get_item_by_index(item_index)
-            popped.append((item_index, item.get_interest()))
-            results.append(item)
-        while len(popped):
-            item_index, item_interest = popped.pop()
-            self.interests.add(item_index, item_interest)
-        return results
+        """Returns a list of the highest-view count SearchItems, by recent
+        views if a half life is set. Reads the published leaderboard 
+        without modifying it, after applying buffered events that are
+        due to be flushed."""
+        self.flush_interests(due_only=True)
+        return [self.items[i] for i in self.interests.top(limit)]
+    
+    def compact(self, min_ratio: float=0.0) -> bool:
+        """Renumbers the SearchItem indices to reclaim removed indices.
+        Precomputed recommendations are dropped since they are stored
+        by index, see SearchGraph.compact()."""
+        if not super().compact(min_ratio):
+            return False
+        if getattr(self, 'pc_path', None):
+            print('[STATUS] compact(): Item indices were renumbered, '
+                  'precomputed recommendations are no longer used. '
+                  'Please generate new ones using save_all_recommends().')
+            self.pc_path = None
+            self._store = None
+        self._changed.clear()
+        self._stale.clear()
+        self._new_rows.clear()
+        return True
+    
+    def _auto_compact(self) -> bool:
+        """Compacts after a removal, see SearchGraph._auto_compact(), 
+        unless precomputed recommendations are used. Their rows are stored
+        by index, so they are only dropped by an explicit compact()."""
+        if getattr(self, 'pc_path', None):
+            return False
+        return super()._auto_compact()
     
     def _extend_results(self, results: list[int],
                         item_index: int, 
-                        limit: int) -> list[SearchItem]:
-        """Extends the results until limit is reached."""
+                        limit: int,
+                        recommends: list[int]=None) -> list[SearchItem]:
+        """Extends the results until limit is reached, from the given 
+        recommendations of item_index if they were already computed."""
         # return if limit reached      
         if len(results) > limit:
             return [self.get_item_by_index(i) for i in results]
@@ -168,7 +434,9 @@ class SearchEngine(SearchGraph):
             result = self.get_item_by_index(i)
             # likely not same series, find more recommendations
             if name_similarity(name, result.get_name()) <= 0.5:
-                for j in self._recommend(item_index, limit-len(results)):
+                more = self._recommend(item_index, limit-len(results)) \
+                    if recommends is None else recommends[:limit-len(results)]
+                for j in more:
                     if len(results) > limit:
                         break
                     results.append(j)
@@ -185,52 +453,174 @@ class SearchEngine(SearchGraph):
             results.append(self.get_item_by_index(item_index))
         return results
     
-    def save_all_recommends(self, dir_path: str, 
+    def save_all_recommends(self, file_path: str, 
                             start_index: int=0, 
                             end_index: int=None, 
-                            p_count: int=cpu_count()) -> FileIO:
-        """Saves all recommendations into a given filepath. 
+                            p_count: int=cpu_count(),
+                            batch_size: int=None,
+                            chunk_size: int=256) -> FileIO:
+        """Saves all recommendations into a RecommendStore at a given
+        filepath. An existing store of the same size is updated in-place.
+        
+        The graph edges are published once to a memory-mapped file that
+        every worker process maps, and work is dispatched in chunks of item
+        indices. Finished chunks are recorded in a checkpoint manifest next
+        to the store, so an interrupted run resumes where it stopped.
         
         This function uses multiprocessing and must be run 
         inside a __main__ method.
         
         Args:
-            dir_path: A str directory path to store all results.
+            file_path: A str file path to store all results.
             start_index: An (optional) int item index to start at.
                 Defaults to 0.
             end_index: An (optional) int item index to end at (exclusive).
                 Defaults to max index.
             p_count: An (optional) int number of processors to run. 
                 Defaults to max available processors.
+            batch_size: An (optional) int number of sources to compute
+                together with batch_top_k(). Requires scipy. 
+                Defaults to one source at a time.
+            chunk_size: An (optional) int number of item indices per task
+                and checkpoint. Defaults to 256.
         """
         size = len(self.items)
         if end_index is None:
             end_index = size
-        # create directory if it doesn't exist
-        if not os.path.isdir(dir_path):
-            os.mkdir(dir_path)
+        batch = batch_size and HAS_CSGRAPH and \
+            self.algorithm in SHORTEST_PATH_ALGORITHMS
+        if batch_size and not batch:
+            print('[STATUS] save_all_recommends(): Batches require scipy '
+                  'and a shortest path algorithm, computing one source '
+                  'at a time.')
+        # skip chunks finished by a previous run
+        manifest_path = file_path + '.manifest'
+        header = {'size': size, 'k': RECOMMEND_LIMIT, 
+                  'algorithm': self.algorithm, 'start': start_index, 
+                  'end': end_index, 'chunk_size': chunk_size}
+        done = _read_manifest(manifest_path, header) \
+            if os.path.exists(file_path) else set()
+        chunks = [(i, min(i + chunk_size, end_index)) 
+                  for i in range(start_index, end_index, chunk_size)
+                  if i not in done]
+        store = self._open_store(file_path)
+        total = sum(end - start for start, end in chunks)
         print(f'[STATUS] save_all_recommends(): '
-              f'Computing {end_index-start_index} '
-              f'recommendations using {p_count} processors.')
+              f'Computing {total} recommendations using {p_count} processors'
+              f'{f", resuming after {len(done)} chunks" if done else ""}.')
         t0 = time()
-        # save all recommendations by index
-        self._rec_path = dir_path
-        with Pool(processes=p_count) as pool:
-            pool.map(self._save_recommend, 
-                     (i for i in range(start_index, end_index)))
+        # publish the graph edges once for all workers
+        graph_path = file_path + '.graph'
+        self._save_edges(graph_path)
+        if not done:
+            _write_manifest(manifest_path, header)
+        computed = 0
+        last_report = t0
+        with Pool(processes=p_count, 
+                  initializer=_init_worker,
+                  initargs=(graph_path, self.algorithm, 
+                            batch_size if batch else None)) as pool, \
+                open(manifest_path, 'a') as manifest:
+            for start, results in pool.imap_unordered(_compute_chunk, chunks):
+                for item_index, nearest in results:
+                    store.set(item_index, nearest)
+                # checkpoint after the rows reach the store file
+                store.flush()
+                manifest.write(f'{json.dumps({"done": start})}\n')
+                manifest.flush()
+                computed += len(results)
+                # report progress at most every 10 seconds
+                if time() - last_report >= 10 or computed == total:
+                    last_report = time()
+                    elapsed = last_report - t0
+                    eta = elapsed / computed * (total - computed)
+                    print(f'[STATUS] save_all_recommends(): '
+                          f'{computed}/{total} recommendations, '
+                          f'{elapsed:.0f} s elapsed, ETA {eta:.0f} s.')
+        store.close()
+        os.remove(graph_path)
+        os.remove(manifest_path)
+        # reopen the precomputed store if it was rewritten
+        if getattr(self, 'pc_path', None) == file_path:
+            self._store = None
+            self._stale.clear()
+            self._new_rows.clear()
         print(f'[STATUS] save_all_recommends(): '
-              f'Saving {end_index-start_index} recommendations to {dir_path}.\n'
+              f'Saving {end_index-start_index} recommendations to {file_path}.\n'
               f'   > Finished in {time()-t0} seconds.')
-            
-    def _save_recommend(self, item_index: int) -> FileIO:
-        """Returns a list of top 100 results from 
-        a tuple of item index and dir path."""
-        item_index, dir_path = item_index, self._rec_path
-        results = self.parse_results(dijkstra(self, item_index), 100)
-        item_indices = []
-        for item in results:
-            wtf_name = wordtrie_format(item.get_name())
-            item_indices.append(self.item_dict[wtf_name])
-        file_path = os.path.join(dir_path, f'{item_index}.pkl')
-        with open(file_path, 'wb') as f:
-            pickle.dump(item_indices, f)
+        
+    def _save_edges(self, file_path: str) -> FileIO:
+        """Saves the graph edges and removed item indices as a snapshot
+        that worker processes can memory-map."""
+        graph = self.to_sparse()
+        write_snapshot(file_path, {
+            'offsets': graph.offsets,
+            'indices': graph.indices,
+            'weights': graph.weights,
+            'removed': array('i', sorted(self.removed)),
+        })
+        
+    def _open_store(self, file_path: str) -> RecommendStore:
+        """Opens a writable RecommendStore for the current items, 
+        creating a new one if the file does not match."""
+        try:
+            store = RecommendStore(file_path, writable=True)
+            if len(store) == len(self.items) and store.k == RECOMMEND_LIMIT:
+                return store
+            store.close()
+        except (OSError, ValueError):
+            pass
+        return RecommendStore.create(file_path, len(self.items), 
+                                     RECOMMEND_LIMIT)
+
+
+# per-process state for save_all_recommends() workers
+_worker: dict[str, Any] = {}
+
+
+def _init_worker(graph_path: str, algorithm: str, batch_size: int) -> None:
+    """Maps the published graph edges once per worker process."""
+    sections = read_snapshot(graph_path)
+    graph = SearchGraph()
+    graph.graph = SparseAdjacency(sections['offsets'].cast('q'),
+                                  sections['indices'].cast('i'),
+                                  sections['weights'].cast('d'))
+    # only edges are published, item indices stand in for items
+    graph.items = [None] * len(graph.graph)
+    graph.removed = set(sections['removed'].cast('i'))
+    _worker['graph'] = graph
+    _worker['top_k'] = TOP_K_ALGORITHMS[algorithm]
+    _worker['batch_size'] = batch_size
+
+
+def _compute_chunk(bounds: tuple[int, int]) -> tuple[int, list[tuple[int, list[tuple[int, float]]]]]:
+    """Computes the recommendations of a (start, end) chunk of item 
+    indices inside a worker process."""
+    start, end = bounds
+    graph = _worker['graph']
+    if _worker['batch_size']:
+        results = list(batch_top_k(graph, range(start, end), 
+                                   RECOMMEND_LIMIT, _worker['batch_size']))
+    else:
+        top_k = _worker['top_k']
+        results = [(i, top_k(graph, i, RECOMMEND_LIMIT) or []) 
+                   for i in range(start, end)]
+    return start, results
+
+
+def _read_manifest(file_path: str, header: dict[str, Any]) -> set[int]:
+    """Returns the set of finished chunk starts from a checkpoint manifest,
+    empty if there is no manifest for the given run header."""
+    try:
+        with open(file_path) as f:
+            if json.loads(f.readline()) != header:
+                return set()
+            return {json.loads(line)['done'] for line in f if line.strip()}
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def _write_manifest(file_path: str, header: dict[str, Any]) -> FileIO:
+    """Starts a new checkpoint manifest with the given run header."""
+    with open(file_path, 'w') as f:
+        f.write(f'{json.dumps(header)}\n')
@@ -0,0 +1,313 @@
+"""This file contains RadixTrie, a compressed radix (Patricia) trie with
+the same auto-complete interface as WordTrie.
+"""
+from __future__ import annotations
+from heapq import heappop, heappush
+from typing import Iterable
+
+
+class RadixNode:
+    """This class represents a node in a radix trie. Each node is reached
+    by an edge labeled with a str of one or more letters.
+
+    Attribute:
+        label: A str of letters on the edge from the parent RadixNode.
+        children: A dict mapping the first letter of each child's label
+            to the child RadixNode.
+        is_word: A bool to determine if the current RadixNode is a word.
+        score: A float ranking score of the word, if it is a word.
+        best: A float highest score of the words below the current
+            RadixNode, including its own word.
+    """
+    __slots__ = ('label', 'children', 'is_word', 'score', 'best')
+
+    def __init__(self,
+                 label: str,
+                 children: dict[str, RadixNode]=None,
+                 is_word: bool=False) -> None:
+        """Constructs a RadixNode object from the given data.
+
+        Args:
+            label: A str of letters on the edge from the parent RadixNode.
+            children: An (optional) dict of children RadixNodes by the
+                first letter of their label. Defaults to no children.
+            is_word: An (optional) bool to determine if the current
+                RadixNode is a word. Defaults to False.
+
+        Returns:
+            None.
+        """
+        self.label = label
+        self.children = {} if children is None else children
+        self.is_word = is_word
+        self.score = 0.0
+        self.best = 0.0 if is_word else float('-inf')
+
+
+class RadixTrie:
+    """This class uses a radix trie data-structure to provide
+    auto-complete functionalities. Chains of single-child nodes are
+    merged into one node with a multi-letter edge label, so a word
+    takes at most one new node and one split node.
+    
+    Suggestions are ranked like WordTrie, highest score first, then
+    shortest first. Every RadixNode keeps the best score below it, so 
+    suggestions are found best-first without visiting all completions.
+
+    Attributes:
+        root: A root RadixNode with an empty label.
+        node_count: An int number of connected RadixNodes (excludes root).
+        word_count: An int number of words stored in the RadixTrie.
+        frozen: A bool to determine if the RadixTrie rejects mutation.
+        pending_factor: A float rescale factor deferred while frozen.
+    """
+    def __init__(self, word_bank: Iterable[str]=[]) -> None:
+        """Construcuts a RadixTrie object.
+
+        Args:
+            word_bank: An (optional) iterable of words to construct
+                the RadixTrie with. Defaults to empty.
+
+        Returns:
+            None.
+        """
+        self.root = RadixNode('')
+        self.node_count = 0
+        self.word_count = 0
+        self.frozen = False
+        self.pending_factor = 1.0
+        for word in word_bank:
+            self.add_words(word)
+
+    def __contains__(self, word: str) -> bool:
+        """Returns True if word is in the RadixTrie, False otherwise."""
+        node, rest = self._find_node(word)
+        return node is not None and not rest and node.is_word
+
+    def freeze(self, frozen: bool=True) -> None:
+        """Sets the RadixTrie to reject (or accept) mutation,
+        see WordTrie.freeze()."""
+        self.frozen = frozen
+        if not frozen and self.pending_factor != 1.0:
+            self.rescale_scores(self.pending_factor)
+            self.pending_factor = 1.0
+
+    def add_words(self, *words: str) -> None:
+        """Adds the given str word(s) into the current RadixTrie."""
+        if self._is_frozen('add_words'):
+            return
+        for word in words:
+            path = self._insert(word)
+            node = path[-1]
+            if not node.is_word:
+                node.is_word = True
+                node.score = 0.0
+                self.word_count += 1
+                self._update_best(path)
+
+    def remove_words(self, *words: str) -> None:
+        """Removes the given str word(s) from the current RadixTrie."""
+        if self._is_frozen('remove_words'):
+            return
+        for word in words:
+            self._remove(word)
+
+    def set_scores(self, scores: dict[str, float]) -> None:
+        """Sets the ranking scores of the given words, higher scores are
+        suggested first. Words that are not in the RadixTrie are ignored.
+        
+        Args:
+            scores: A dict mapping str words to float scores.
+            
+        Returns:
+            None.
+        """
+        if self._is_frozen('set_scores'):
+            return
+        for word, score in scores.items():
+            path = self._find_path(word)
+            if path is None or not path[-1].is_word:
+                continue
+            path[-1].score = score
+            self._update_best(path)
+            
+    def rescale_scores(self, factor: float) -> None:
+        """Multiplies all ranking scores by a float factor, 
+        e.g. a DecayClock.rescale() factor. A frozen RadixTrie defers 
+        it until freeze(False), see WordTrie.rescale_scores()."""
+        if self.frozen:
+            self.pending_factor *= factor
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node.score *= factor
+            node.best *= factor
+            stack.extend(node.children.values())
+
+    def word_suggestions(self, query: str, limit: int=10) -> list:
+        """Takes in a str query and returns a list of possible
+        words matching the query substring from the RadixTrie.
+
+        Args:
+            query: A str query.
+            limit: An (optional) int for max word suggestions.
+                Defaults to 10 suggestions.
+
+        Returns:
+            A list of complete words that matches the given query.
+        """
+        words = []
+        node, rest = self._find_node(query)
+        if node is None or limit <= 0:
+            return words
+        # the query may end inside the node's label
+        prefix = query + rest
+        # words are ranked by (-score, length, word), and a RadixNode is 
+        # keyed before every word below it by its best score and prefix
+        heap = [(-node.best, len(prefix), prefix, 1, node)]
+        while heap:
+            score, length, prefix, is_node, node = heappop(heap)
+            if not is_node:
+                words.append(prefix)
+                if len(words) >= limit:
+                    break
+                continue
+            if node.is_word:
+                heappush(heap, (-node.score, length, prefix, 0, None))
+            for child in node.children.values():
+                child_prefix = prefix + child.label
+                heappush(heap, (-child.best, len(child_prefix), 
+                                child_prefix, 1, child))
+        return words
+
+    def _find_node(self, letters: str) -> tuple[RadixNode, str]:
+        """Finds the RadixNode whose path starts with letters without
+        modifying the RadixTrie.
+
+        Returns:
+            A tuple of the RadixNode and the str remainder of its label
+            after letters, (None, '') if letters are not in the RadixTrie.
+        """
+        node = self.root
+        i = 0
+        while i < len(letters):
+            child = node.children.get(letters[i])
+            if child is None:
+                return None, ''
+            label = child.label
+            # letters end inside the label
+            if len(letters) - i < len(label):
+                if label.startswith(letters[i:]):
+                    return child, label[len(letters) - i:]
+                return None, ''
+            if not letters.startswith(label, i):
+                return None, ''
+            i += len(label)
+            node = child
+        return node, ''
+
+    def _find_path(self, word: str) -> list[RadixNode]:
+        """Returns the list of RadixNodes from the root to the RadixNode 
+        of a word, None if the word ends inside a label or is not in
+        the RadixTrie."""
+        path = [self.root]
+        i = 0
+        while i < len(word):
+            child = path[-1].children.get(word[i])
+            if child is None or not word.startswith(child.label, i):
+                return None
+            i += len(child.label)
+            path.append(child)
+        return path
+
+    def _insert(self, word: str) -> list[RadixNode]:
+        """Returns the list of RadixNodes from the root to the RadixNode
+        of a word, splitting edges and creating RadixNodes as needed."""
+        node = self.root
+        path = [node]
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                # add the rest of the word as one edge
+                child = RadixNode(word[i:])
+                node.children[word[i]] = child
+                self.node_count += 1
+                path.append(child)
+                return path
+            label = child.label
+            # length of the common prefix of the label and the word
+            common = 1
+            limit = min(len(label), len(word) - i)
+            while common < limit and label[common] == word[i + common]:
+                common += 1
+            if common < len(label):
+                # split the edge at the common prefix
+                split = RadixNode(label[:common], {label[common]: child})
+                split.best = child.best
+                child.label = label[common:]
+                node.children[word[i]] = split
+                self.node_count += 1
+                child = split
+            i += common
+            node = child
+            path.append(node)
+        return path
+
+    def _remove(self, word: str) -> None:
+        """Unsets a word and merges or deletes the RadixNodes it no
+        longer needs."""
+        path = self._find_path(word)
+        if path is None or not path[-1].is_word:
+            return
+        node = path[-1]
+        node.is_word = False
+        node.score = 0.0
+        self.word_count -= 1
+        if len(path) == 1:
+            self._update_best(path)
+            return
+        parent = path[-2]
+        if not node.children:
+            del parent.children[node.label[0]]
+            self.node_count -= 1
+            path.pop()
+            # the parent may now be mergeable with its only child
+            if parent is not self.root and not parent.is_word and \
+                    len(parent.children) == 1:
+                self._merge(parent)
+        elif len(node.children) == 1:
+            self._merge(node)
+        self._update_best(path)
+
+    def _merge(self, node: RadixNode) -> None:
+        """Merges a non-word RadixNode with its only child. The best 
+        score is left to _update_best()."""
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.is_word = child.is_word
+        node.score = child.score
+        self.node_count -= 1
+        
+    def _update_best(self, path: list[RadixNode]) -> None:
+        """Updates the best scores along a path of RadixNodes from the 
+        root, from the end of the path up to the root."""
+        for node in reversed(path):
+            best = node.score if node.is_word else float('-inf')
+            for child in node.children.values():
+                if child.best > best:
+                    best = child.best
+            # ancestors only change if the RadixNode changed
+            if best == node.best:
+                break
+            node.best = best
+
+    def _is_frozen(self, caller: str) -> bool:
+        """Returns True and reports the aborted caller if the RadixTrie
+        is frozen, False otherwise."""
+        if not self.frozen:
+            return False
+        print(f'[ABORTED] {caller}(): RadixTrie is frozen.')
+        return True
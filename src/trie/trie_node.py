@@ -9,6 +9,10 @@ class TrieNode:
         letter: A str letter represented by the current TrieNode.
         children: A dict of children TrieNodes.
         is_word: A bool to determine if the current TrieNode is a word.
+        score: A float ranking score of the word, if it is a word.
+        top: A list of the highest-ranked completions below the current
+            TrieNode, as sorted tuples of negated score, word length 
+            and str word.
     """
     def __init__(self, 
                  letter: str, 
@@ -29,6 +33,8 @@ class TrieNode:
         self.letter: str = letter
         self.children: dict[str, TrieNode] = {}
         self.is_word: bool = is_word
+        self.score: float = 0.0
+        self.top: list[tuple[float, int, str]] = []
         # add children
         for child in children:
             self.add_child(child)
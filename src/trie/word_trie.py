@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Iterable
+from bisect import bisect_right, insort
+from heapq import heappop, heappush, merge
+from itertools import islice
+from typing import Any, Iterable
 
 
 from src.trie.trie_node import TrieNode
@@ -9,17 +12,26 @@ class WordTrie:
     """This class uses a trie data-structure to 
     provide auto-complete functionalities.
     
+    Every TrieNode caches its top_k highest-scored completions, updated
+    along the path of a word whenever the word or its score changes, so
+    short suggestion lists are served in O(len(query) + limit).
+    
     Attributes:
         word_trie: A root TrieNode.
         node_count: An int number of connected TrieNodes (excludes root).
         word_count: An int number of words stored in the WordTrie.   
+        frozen: A bool to determine if the WordTrie rejects mutation.
+        pending_factor: A float rescale factor deferred while frozen.
+        top_k: An int number of completions cached per TrieNode.
     """
-    def __init__(self, word_bank: Iterable[str]=[]) -> None:
+    def __init__(self, word_bank: Iterable[str]=[], top_k: int=10) -> None:
         """Construcuts a WordTrie object.
         
         Args:
             word_bank: An (optional) iterable of words to construct
                 the WordTrie with. Defaults to empty.
+            top_k: An (optional) int number of completions cached per 
+                TrieNode. Defaults to 10.
                 
         Returns:
             None.
@@ -27,26 +39,86 @@ class WordTrie:
         self.word_trie = TrieNode(None) # root node
         self.node_count = 0
         self.word_count = 0
+        self.frozen = False
+        self.pending_factor = 1.0
+        self.top_k = top_k
         for word in word_bank:
             self.add_words(word)
             
     def __contains__(self, word: str) -> bool:
         """Returns True if word is in the WordTrie, False otherwise."""
-        return self._traverse_letters(word).check_word()
+        node = self._find_node(word)
+        return node is not None and node.check_word()
+    
+    def freeze(self, frozen: bool=True) -> None:
+        """Sets the WordTrie to reject (or accept) mutation. A frozen 
+        WordTrie is only read, so it can be shared between threads and
+        forked worker processes. Rescales deferred while frozen are
+        applied once it is unfrozen.
+        
+        Args:
+            frozen: An (optional) bool to reject mutation. Defaults to True.
+            
+        Returns:
+            None.
+        """
+        self.frozen = frozen
+        if not frozen and self.pending_factor != 1.0:
+            self.rescale_scores(self.pending_factor)
+            self.pending_factor = 1.0
 
     def add_words(self, *words: str) -> None:
         """Adds the given str word(s) into the current WordTrie."""
+        if self._is_frozen('add_words'):
+            return
         for word in words:
             # go to end of word and set TrieNode as a word
             if self._traverse_letters(word).set_word():
                 self.word_count += 1
+                self._update_top(word, raised=True)
             
     def remove_words(self, *words: str) -> None:
         """Removes the given str word(s) from the current WordTrie."""
+        if self._is_frozen('remove_words'):
+            return
         for word in words:
             # go to end of word and set TrieNode as a non-word
-            if self._traverse_letters(word).remove_word():
+            node = self._find_node(word)
+            if node is not None and node.remove_word():
                 self.word_count -= 1
+                node.score = 0.0
+                self._update_top(word)
+                
+    def set_scores(self, scores: dict[str, float]) -> None:
+        """Sets the ranking scores of the given words, higher scores are
+        suggested first. Words that are not in the WordTrie are ignored.
+        
+        Args:
+            scores: A dict mapping str words to float scores.
+            
+        Returns:
+            None.
+        """
+        if self._is_frozen('set_scores'):
+            return
+        for word, score in scores.items():
+            node = self._find_node(word)
+            if node is None or not node.check_word() or node.score == score:
+                continue
+            raised = score > node.score
+            node.score = score
+            self._update_top(word, raised)
+            
+    def rescale_scores(self, factor: float) -> None:
+        """Multiplies all ranking scores by a float factor, 
+        e.g. a DecayClock.rescale() factor. A frozen WordTrie defers it
+        until freeze(False), so scores set afterwards stay comparable."""
+        if self.frozen:
+            self.pending_factor *= factor
+            return
+        for node in self._nodes():
+            node.score *= factor
+        self._rebuild_top()
 
     def word_suggestions(self, query: str, limit: int=10) -> list:
         """Takes in a str query and returns a list of possible
@@ -60,10 +132,15 @@ class WordTrie:
         Returns:
             A list of complete words that matches the given query.    
         """
-        curr_node = self.word_trie
         words = []
         # traverse to end of query
-        curr_node = self._traverse_letters(query)
+        curr_node = self._find_node(query)
+        if curr_node is None:
+            return words
+        # serve the cached completions, highest score first, 
+        # _get_words() continues in the same order
+        if limit <= self.top_k:
+            return [word for _, _, word in curr_node.top[:limit]]
         self._get_words(curr_node, query, words, limit)
         return words
 
@@ -72,7 +149,15 @@ class WordTrie:
                    query: str, 
                    words: list[str], 
                    limit: int) -> None:
-        """Runs a depth-first-search algorithm on the current TrieNode.
+        """Runs an iterative best-first-search on the current TrieNode in 
+        the order of the cached completions: highest score first, then 
+        shortest first. Stops as soon as limit is reached.
+        
+        Every TrieNode serves its cached completions in order, and only
+        once they are used up are its children searched, starting after
+        the cached completions already served by their parent. Visited 
+        TrieNodes are kept with the index of their parent TrieNode, so 
+        only words below the cached completions are built from letters.
         
         Adds words into the given words list.
         
@@ -85,18 +170,167 @@ class WordTrie:
         Returns:
             None.
         """
-        # stop at limit
-        if len(words) >= limit:
-            return
-        # Add to words if node is a word
-        if curr_node.check_word():
-            words.append(query)
-        # traverse through children TrieNodes
-        for node in curr_node.get_children():
-            self._get_words(node, query + node.letter, words, limit)
+        # visited TrieNodes and the index of their parent TrieNode
+        nodes = [curr_node]
+        parents = [-1]
+        heap = []
+        self._push_node(heap, curr_node, 0, 0)
+        while heap and len(words) < limit:
+            key, index, position = heappop(heap)
+            if index < 0:
+                # the word of a searched TrieNode
+                words.append(key[2])
+                continue
+            node = nodes[index]
+            top = node.top
+            if position < len(top):
+                # the next cached completion of the TrieNode
+                words.append(top[position][2])
+                self._push_node(heap, node, index, position + 1)
+                continue
+            # cached completions are used up, search the children.
+            # the word of the TrieNode was cached if it scores as high
+            # as the last cached completion, being the shortest below
+            if node.check_word() and not (top and -node.score <= top[-1][0]):
+                # build the word only if it was not cached
+                letters = []
+                parent = index
+                while parent > 0:
+                    letters.append(nodes[parent].letter)
+                    parent = parents[parent]
+                word = query + ''.join(reversed(letters))
+                heappush(heap, ((-node.score, len(word), word), -1, -1))
+            for child in node.get_children():
+                nodes.append(child)
+                parents.append(index)
+                # the cached completions are the first of every child's
+                served = bisect_right(child.top, top[-1]) if top else 0
+                self._push_node(heap, child, len(nodes) - 1, served)
+                
+    def _push_node(self, 
+                   heap: list, 
+                   node: TrieNode, 
+                   index: int, 
+                   position: int) -> None:
+        """Pushes a TrieNode onto a _get_words() heap by its index, keyed 
+        by its cached completion at position. Once the cached completions
+        are used up, it is keyed by the last one, which comes before the
+        remaining words below. TrieNodes without remaining words are 
+        skipped."""
+        top = node.top
+        if position < len(top):
+            key = top[position]
+        elif position < self.top_k:
+            return # all words below were cached
+        elif top:
+            key = top[-1]
+        else:
+            # without cached completions, key before every word
+            key = (float('-inf'),)
+        heappush(heap, (key, index, position))
+    
+    def _find_node(self, letters: str) -> TrieNode:
+        """Returns the TrieNode at the end of letters without creating
+        TrieNodes, None if letters are not in the WordTrie."""
+        curr_node = self.word_trie
+        for letter in letters:
+            curr_node = curr_node.get_child(letter)
+            # stop at the first missing letter
+            if curr_node is None:
+                return None
+        return curr_node
+    
+    def _update_top(self, word: str, raised: bool=False) -> None:
+        """Updates the cached completions along the path of a word,
+        from the word's TrieNode up to the root.
+        
+        Args:
+            word: A str word that was added, removed or rescored.
+            raised: An (optional) bool, True if the word was added or its
+                score increased, which only needs the word inserted into
+                the cached completions. Defaults to False.
+                
+        Returns:
+            None.
+        """
+        path = [self.word_trie]
+        for letter in word:
+            path.append(path[-1].get_child(letter))
+        entry = (-path[-1].score, len(word), word)
+        for depth in range(len(word), -1, -1):
+            node = path[depth]
+            if not raised:
+                top = self._merge_top(node, word[:depth])
+            elif depth < len(word) and not node.check_word() and \
+                    len(node.children) == 1:
+                # share the only child's completions
+                top = path[depth+1].top
+            else:
+                top = [other for other in node.top if other[2] != word]
+                insort(top, entry)
+                del top[self.top_k:]
+            # ancestors only change if the TrieNode changed
+            if top == node.top:
+                break
+            node.top = top
+            
+    def _merge_top(self, node: TrieNode, prefix: str) -> list[tuple[float, int, str]]:
+        """Returns the top_k completions of a TrieNode, merged from its 
+        own word given by prefix and the cached completions of its 
+        children."""
+        children = node.children.values()
+        # share the only child's completions
+        if not node.check_word() and len(children) == 1:
+            return next(iter(children)).top
+        tops = [child.top for child in children]
+        if node.check_word():
+            tops.append([(-node.score, len(prefix), prefix)])
+        return list(islice(merge(*tops), self.top_k))
+    
+    def _rebuild_top(self) -> None:
+        """Rebuilds the cached completions of every TrieNode."""
+        # children are rebuilt before their parents
+        stack = [(self.word_trie, '', False)]
+        while stack:
+            node, prefix, visited = stack.pop()
+            if visited:
+                node.top = self._merge_top(node, prefix)
+                continue
+            stack.append((node, prefix, True))
+            for child in node.get_children():
+                stack.append((child, prefix + child.letter, False))
+                
+    def _nodes(self) -> Iterable[TrieNode]:
+        """Returns an iterator over all TrieNodes."""
+        stack = [self.word_trie]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.get_children())
+            
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores a pickled WordTrie, adding cached completions to
+        WordTries pickled without them."""
+        self.frozen = False
+        self.pending_factor = 1.0
+        self.__dict__.update(state)
+        if 'top_k' not in state:
+            self.top_k = 10
+            for node in self._nodes():
+                node.score = 0.0
+            self._rebuild_top()
+    
+    def _is_frozen(self, caller: str) -> bool:
+        """Returns True and reports the aborted caller if the WordTrie
+        is frozen, False otherwise."""
+        if not self.frozen:
+            return False
+        print(f'[ABORTED] {caller}(): WordTrie is frozen.')
+        return True
     
     def _traverse_letters(self, letters: str) -> TrieNode:
-        """Traverse through the WordTrie until the end of letters."""
+        """Traverse through the WordTrie until the end of letters,
+        creating missing TrieNodes."""
         curr_node = self.word_trie
         # for each character in the word do sum
         for letter in letters:
@@ -0,0 +1,179 @@
+"""This file contains the InterestBuffer class, a data structure to
+aggregate click and appearance events before they are applied, and 
+ShardedInterestBuffer, a per-thread sharded InterestBuffer.
+"""
+from threading import Lock, Thread, current_thread, local
+from time import time
+from typing import Hashable
+
+
+class InterestBuffer:
+    """This class provides a buffer of click and appearance counts per
+    item. Events are aggregated as they are added, so applying a buffer
+    costs one update per item instead of one per event.
+
+    Attributes:
+        max_events: An int number of buffered events before a flush is due.
+        interval: A float number of seconds after the last flush before
+            a flush is due.
+        clicks: A dict mapping items to buffered click counts.
+        appears: A dict mapping items to buffered appearance counts.
+        count: An int number of buffered events.
+        last_flush: A float time in seconds of the last drain().
+        lock: A Lock guarding the buffer when it is shared between threads.
+    """
+    def __init__(self, max_events: int=1024, interval: float=1.0) -> None:
+        """Constructs an InterestBuffer object.
+
+        Args:
+            max_events: An (optional) int number of buffered events
+                before a flush is due. Defaults to 1024.
+            interval: An (optional) float number of seconds after the last
+                flush before a flush is due. Defaults to 1.0.
+
+        Returns:
+            None.
+        """
+        self.max_events = max_events
+        self.interval = interval
+        self.clicks: dict[Hashable, int] = {}
+        self.appears: dict[Hashable, int] = {}
+        self.count = 0
+        self.last_flush = time()
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        """Returns the int number of buffered events."""
+        return self.count
+
+    def add_click(self, item: Hashable) -> bool:
+        """Buffers a click on an item.
+        Returns True if a flush is due, False otherwise."""
+        self.clicks[item] = self.clicks.get(item, 0) + 1
+        self.count += 1
+        return self.is_due()
+
+    def add_appear(self, item: Hashable) -> bool:
+        """Buffers an appearance of an item.
+        Returns True if a flush is due, False otherwise."""
+        self.appears[item] = self.appears.get(item, 0) + 1
+        self.count += 1
+        return self.is_due()
+
+    def is_due(self) -> bool:
+        """Returns True if the buffer is full or the flush interval
+        has passed with events buffered, False otherwise."""
+        return self.count >= self.max_events or \
+            self.count > 0 and time() - self.last_flush >= self.interval
+
+    def drain(self) -> tuple[dict[Hashable, int], dict[Hashable, int]]:
+        """Empties the buffer.
+
+        Returns:
+            A tuple of dicts mapping items to click counts and
+            appearance counts.
+        """
+        clicks, appears = self.clicks, self.appears
+        self.clicks, self.appears = {}, {}
+        self.count = 0
+        self.last_flush = time()
+        return clicks, appears
+
+
+class ShardedInterestBuffer:
+    """This class provides an InterestBuffer for concurrent writers.
+
+    Every thread adds events to its own InterestBuffer shard, guarded by 
+    a per-shard lock that is only contended while the shard is drained.
+    drain() merges all shards and drops the shards of finished threads.
+
+    Attributes:
+        max_events: An int number of buffered events in a shard before
+            a flush is due.
+        interval: A float number of seconds after the last flush before
+            a flush is due.
+        shards: A list of InterestBuffer shards, one per writing thread
+            that is alive or has undrained events.
+    """
+    def __init__(self, max_events: int=1024, interval: float=1.0) -> None:
+        """Constructs a ShardedInterestBuffer object.
+
+        Args:
+            max_events: An (optional) int number of buffered events in a
+                shard before a flush is due. Defaults to 1024.
+            interval: An (optional) float number of seconds after the last
+                flush before a flush is due. Defaults to 1.0.
+
+        Returns:
+            None.
+        """
+        self.max_events = max_events
+        self.interval = interval
+        self.shards: list[InterestBuffer] = []
+        self._threads: list[Thread] = [] # writing thread of each shard
+        self._local = local() # shard of the current thread
+        self._lock = Lock() # guards the list of shards
+
+    def __len__(self) -> int:
+        """Returns the approximate int number of buffered events."""
+        return sum(len(shard) for shard in self.shards)
+
+    def add_click(self, item: Hashable) -> bool:
+        """Buffers a click on an item in the current thread's shard.
+        Returns True if a flush is due, False otherwise."""
+        shard = self._shard()
+        with shard.lock:
+            return shard.add_click(item)
+
+    def add_appear(self, item: Hashable) -> bool:
+        """Buffers an appearance of an item in the current thread's shard.
+        Returns True if a flush is due, False otherwise."""
+        shard = self._shard()
+        with shard.lock:
+            return shard.add_appear(item)
+
+    def is_due(self) -> bool:
+        """Returns True if any shard is due to be flushed,
+        False otherwise."""
+        return any(shard.is_due() for shard in self.shards)
+
+    def drain(self) -> tuple[dict[Hashable, int], dict[Hashable, int]]:
+        """Empties all shards and merges their events.
+
+        Returns:
+            A tuple of dicts mapping items to click counts and
+            appearance counts.
+        """
+        clicks: dict[Hashable, int] = {}
+        appears: dict[Hashable, int] = {}
+        with self._lock:
+            shards = list(self.shards)
+        for shard in shards:
+            with shard.lock:
+                shard_clicks, shard_appears = shard.drain()
+            for merged, counts in ((clicks, shard_clicks), 
+                                   (appears, shard_appears)):
+                for item, count in counts.items():
+                    merged[item] = merged.get(item, 0) + count
+        # finished threads add no more events to their drained shards
+        with self._lock:
+            live = [(thread, shard) 
+                    for thread, shard in zip(self._threads, self.shards)
+                    if thread.is_alive() or len(shard)]
+            if len(live) < len(self.shards):
+                self._threads = [thread for thread, _ in live]
+                self.shards = [shard for _, shard in live]
+        return clicks, appears
+
+    def _shard(self) -> InterestBuffer:
+        """Returns the InterestBuffer shard of the current thread,
+        creating it on the thread's first event."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = InterestBuffer(self.max_events, self.interval)
+            with self._lock:
+                # replace the lists, readers may iterate the old ones
+                self._threads = self._threads + [current_thread()]
+                self.shards = self.shards + [shard]
+            self._local.shard = shard
+        return shard
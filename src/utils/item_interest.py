@@ -1,6 +1,76 @@
+"""This file contains ItemInterest, a data encapsulator for item
+interest counts, and DecayClock, a clock for time-decayed interest.
+"""
+from math import exp, log
+from time import time
 from typing import Callable
 
 
+# default interest weights
+CLICK_WEIGHT = 5
+APPEAR_WEIGHT = 1
+# largest DecayClock exponent before interests are renormalized,
+# i.e. a scale of 2 ** 64
+RESCALE_EXPONENT = 64 * log(2)
+
+
+class DecayClock:
+    """This class provides a global scale for exponentially time-decayed
+    scores.
+    
+    Instead of decaying every score over time, an event at time t is 
+    weighted by scale(t) = exp(rate * (t - origin)). Scores decayed to 
+    the current time are the stored scores divided by the current scale,
+    which keeps the order of stored scores. Stored scores only need to 
+    be renormalized by rescale() once the scale grows too large.
+    
+    Attributes:
+        half_life: A float number of seconds for a score to halve.
+        rate: A float decay rate per second.
+        origin: A float time in seconds where the scale is 1.
+    """
+    def __init__(self, half_life: float) -> None:
+        """Constructs a DecayClock object.
+        
+        Args:
+            half_life: A float number of seconds for a score to halve.
+            
+        Returns:
+            None.
+        """
+        self.half_life = half_life
+        self.rate = log(2) / half_life
+        self.origin = time()
+        
+    def exponent(self) -> float:
+        """Returns the float log of the scale at the current time."""
+        return self.rate * (time() - self.origin)
+        
+    def scale(self) -> float:
+        """Returns the float scale of an event at the current time."""
+        return exp(self.exponent())
+    
+    def needs_rescale(self, exponent: float) -> bool:
+        """Returns True if scores must be renormalized before storing
+        events of a given exponent(), False otherwise. The exponent is
+        checked instead of the scale, which overflows after about 1024
+        idle half lives."""
+        return exponent > RESCALE_EXPONENT
+    
+    def rescale(self) -> float:
+        """Moves the origin to the current time.
+        
+        Returns:
+            A float factor to multiply all stored scores by. It is 
+            computed from the exponent, so it goes to 0.0 instead of 
+            overflowing after a long idle time.
+        """
+        now = time()
+        factor = exp(-self.rate * (now - self.origin))
+        self.origin = now
+        return factor
+
+
 class ItemInterest:
     """This class is a simple data encapsulator to track the number of
     click counts, and appearances of an item.
@@ -8,6 +78,8 @@ class ItemInterest:
     Attributes:
         clicks: An int number of clicks on an item.
         appears: An int number of appearances on an item.
+        decayed: A float interest with events weighted by a DecayClock 
+            scale, see get_decayed_interest().
     """
     def __init__(self, clicks: int=0, appears: int=0) -> None:
         """Constructs an ItemInterest object.
@@ -23,14 +95,37 @@ class ItemInterest:
         """
         self.clicks = clicks
         self.appears = appears
+        self.decayed = CLICK_WEIGHT * clicks + APPEAR_WEIGHT * appears
+        
+    def __setstate__(self, state: dict) -> None:
+        """Restores a pickled ItemInterest, deriving the decayed interest 
+        of ItemInterests pickled without it from all-time counts."""
+        self.__dict__.update(state)
+        if 'decayed' not in state:
+            self.decayed = CLICK_WEIGHT * self.clicks + \
+                APPEAR_WEIGHT * self.appears
         
-    def add_click(self) -> None:
-        """Adds a click."""
-        self.clicks += 1
+    def add_click(self, scale: float=1.0, count: int=1) -> None:
+        """Adds (optional) count clicks, weighted by an (optional) 
+        DecayClock scale."""
+        self.clicks += count
+        self.decayed += CLICK_WEIGHT * scale * count
         
-    def add_appear(self) -> None:
-        """Adds an appearance."""
-        self.appears += 1
+    def add_appear(self, scale: float=1.0, count: int=1) -> None:
+        """Adds (optional) count appearances, weighted by an (optional) 
+        DecayClock scale."""
+        self.appears += count
+        self.decayed += APPEAR_WEIGHT * scale * count
+        
+    def get_decayed_interest(self, scale: float=1.0) -> float:
+        """Returns the float time-decayed interest at a given 
+        DecayClock scale, e.g. DecayClock.scale() for the current time."""
+        return self.decayed / scale
+    
+    def rescale(self, factor: float) -> None:
+        """Multiplies the decayed interest by a DecayClock.rescale() 
+        factor."""
+        self.decayed *= factor
         
     def get_interest(self, custom_func: Callable=None) -> float:
         """Calculates the interest in an item.
@@ -44,5 +139,5 @@ class ItemInterest:
             A calculated float interest.
         """
         if custom_func is None:
-            return 5 * self.clicks + self.appears
+            return CLICK_WEIGHT * self.clicks + APPEAR_WEIGHT * self.appears
         return custom_func(self.clicks, self.appears)
\ No newline at end of file
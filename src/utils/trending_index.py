@@ -0,0 +1,170 @@
+"""This file contains the TrendingIndex class, a data structure
+to serve the highest-scored items without sorting all items.
+"""
+from bisect import bisect_right
+from heapq import nlargest
+from math import frexp
+from operator import itemgetter
+from typing import Hashable
+
+
+class TrendingIndex:
+    """This class provides a leaderboard of the highest-scored items.
+
+    The top capacity items are kept sorted in a bounded leaderboard, which
+    is published as an immutable tuple for readers. All scores are also
+    grouped into power-of-two buckets, so the leaderboard can be refilled
+    from the highest buckets without scanning every item.
+
+    Attributes:
+        capacity: An int number of items kept on the leaderboard.
+    """
+    def __init__(self, capacity: int=100) -> None:
+        """Constructs a TrendingIndex object.
+
+        Args:
+            capacity: An (optional) int number of items kept on the
+                leaderboard. Defaults to 100.
+
+        Returns:
+            None.
+        """
+        self.capacity = capacity
+        self._scores: dict[Hashable, float] = {} # scores of all items
+        self._buckets: dict[float, set[Hashable]] = {} # items by bucket
+        self._board: list[Hashable] = [] # leaderboard, highest first
+        self._keys: list[float] = [] # negated leaderboard scores
+        self._top: tuple[Hashable, ...] = () # published leaderboard
+
+    def __len__(self) -> int:
+        """Returns the int number of items."""
+        return len(self._scores)
+
+    def __contains__(self, item: Hashable) -> bool:
+        """Returns True if given item exists, False otherwise."""
+        return item in self._scores
+
+    def get_score(self, item: Hashable) -> float:
+        """Returns the float score of an item, None if it does not exist."""
+        return self._scores.get(item)
+
+    def top(self, limit: int=10) -> tuple[Hashable, ...]:
+        """Returns a tuple of up to limit highest-scored items, highest
+        first. Reads do not modify the TrendingIndex.
+
+        Args:
+            limit: An (optional) int number of items. Defaults to 10.
+
+        Returns:
+            A tuple of items.
+        """
+        if limit <= self.capacity:
+            return self._top[:limit]
+        # beyond the leaderboard
+        return tuple(item for item, _ in nlargest(limit, self._scores.items(),
+                                                  key=itemgetter(1)))
+
+    def update(self, item: Hashable, score: float) -> None:
+        """Sets the score of an item, adding the item if it does not exist.
+
+        Args:
+            item: Any hashable item.
+            score: A float score.
+
+        Returns:
+            None.
+        """
+        old_score = self._scores.get(item)
+        self._scores[item] = score
+        self._move_bucket(item, old_score, score)
+        if old_score is not None and self._unboard(item, old_score):
+            if score < old_score:
+                # a lower score may be passed by items off the leaderboard
+                self._refill()
+                self._publish()
+                return
+        elif len(self._board) >= self.capacity and \
+                -score >= self._keys[-1]:
+            return
+        self._board_insert(item, score)
+        self._publish()
+
+    def remove(self, item: Hashable) -> None:
+        """Removes an item if it exists."""
+        score = self._scores.pop(item, None)
+        if score is None:
+            return
+        self._move_bucket(item, score, None)
+        if self._unboard(item, score):
+            self._refill()
+            self._publish()
+
+    def _board_insert(self, item: Hashable, score: float) -> None:
+        """Inserts an item into the leaderboard, dropping the lowest
+        item if the leaderboard is over capacity."""
+        index = bisect_right(self._keys, -score)
+        self._keys.insert(index, -score)
+        self._board.insert(index, item)
+        if len(self._board) > self.capacity:
+            self._keys.pop()
+            self._board.pop()
+
+    def _unboard(self, item: Hashable, score: float) -> bool:
+        """Removes an item with a given score from the leaderboard.
+        Returns True if the item was on the leaderboard."""
+        if not self._board or -score > self._keys[-1]:
+            return False
+        index = bisect_right(self._keys, -score) - 1
+        # scan items with equal scores
+        while index >= 0 and self._keys[index] == -score:
+            if self._board[index] == item:
+                del self._keys[index]
+                del self._board[index]
+                return True
+            index -= 1
+        return False
+
+    def _refill(self) -> None:
+        """Fills the leaderboard up to capacity with the highest-scored
+        items off the leaderboard, scanning the highest buckets only."""
+        missing = min(self.capacity, len(self._scores)) - len(self._board)
+        if missing <= 0:
+            return
+        on_board = set(self._board)
+        candidates = []
+        for bucket in sorted(self._buckets, reverse=True):
+            candidates.extend(item for item in self._buckets[bucket]
+                              if item not in on_board)
+            # lower buckets only hold lower scores
+            if len(candidates) >= missing:
+                break
+        scores = self._scores
+        for item in nlargest(missing, candidates, key=scores.__getitem__):
+            self._board_insert(item, scores[item])
+
+    def _move_bucket(self, item: Hashable,
+                     old_score: float, score: float) -> None:
+        """Moves an item between buckets after a score change.
+        A None score means the item does not exist."""
+        old_bucket = None if old_score is None else _bucket(old_score)
+        bucket = None if score is None else _bucket(score)
+        if old_bucket == bucket:
+            return
+        if old_bucket is not None:
+            items = self._buckets[old_bucket]
+            items.discard(item)
+            if not items:
+                del self._buckets[old_bucket]
+        if bucket is not None:
+            self._buckets.setdefault(bucket, set()).add(item)
+
+    def _publish(self) -> None:
+        """Publishes the leaderboard as an immutable tuple for readers."""
+        self._top = tuple(self._board)
+
+
+def _bucket(score: float) -> float:
+    """Returns the power-of-two bucket of a score."""
+    if score <= 0:
+        return float('-inf')
+    return frexp(score)[1]
@@ -1,6 +1,7 @@
 """This file contains benchmarking functions for measuring memory efficiency
 """
 import asyncio
+import tracemalloc # for benchmarking
 from random import random
 from statistics import mean # for benchmarking
 from time import time, sleep # for benchmarking
@@ -27,13 +28,30 @@ def generate_items(size: int=10000) -> Iterable[SearchItem]:
     for i in range(size):
         yield SearchItem(str(i), tags={f'tag{i}'}) 
 
-def build_sg():
-    g = se()
-    for item in generate_items():
-        g.add_item(item, weight_func, weight_thres=0)
+def build_sg(sparse: bool=False, size: int=10000, weight_thres: int=0):
+    g = se(sparse=sparse)
+    for item in generate_items(size):
+        g.add_item(item, weight_func, weight_thres=weight_thres)
     return g
 
 
+def benchmark_backends(size: int=5000, weight_thres: int=1):
+    """Compares graph memory and edge-scan time of the dense 
+    and sparse SearchGraph backends."""
+    for sparse in (False, True):
+        tracemalloc.start()
+        g = build_sg(sparse, size, weight_thres)
+        if sparse:
+            g.graph.compress()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        t0 = time()
+        edges = sum(1 for i in range(len(g)) for _ in g.get_edges(i))
+        backend = 'sparse' if sparse else 'dense'
+        print(f'{backend}: {memory / 2**20:.1f} MiB, {edges} edges '
+              f'scanned in {time() - t0:.3f} s.')
+
+
 def build_nx():
     g = sg1()
     for item in generate_items():
@@ -48,4 +66,5 @@ async def main():
     
 
 if __name__ == '__main__':
+    benchmark_backends()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""This file contains regression tests for SearchEngine precomputed
+recommendations stored in a RecommendStore.
+"""
+import unittest # for unit testing
+import tempfile # for store files
+import sys # for import from parent directory
+import os # for import from parent directory
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+from src.graphs.search_algorithms import personalized_pagerank
+from src.graphs.search_item import SearchItem
+from src.graphs.sparse_adjacency import SparseAdjacency
+from src.search_engine.search_engine import SearchEngine
+
+
+def pair_weight(item1: SearchItem, item2: SearchItem) -> float:
+    """Returns a deterministic symmetric float weight of two SearchItems
+    named by ints."""
+    a, b = int(item1.get_name()), int(item2.get_name())
+    return ((a + b) * 7 % 10 + abs(a - b) % 3) / 10
+
+
+def build_engine(size: int, **kwargs) -> SearchEngine:
+    """Returns a sparse SearchEngine of SearchItems named by ints."""
+    engine = SearchEngine(sparse=True, algorithm='lazy_dijkstra', **kwargs)
+    for name in range(size):
+        engine.add_item(SearchItem(str(name), tags=set()), pair_weight, 0.5)
+    return engine
+
+
+class RecommendStoreTest(unittest.TestCase):
+    """Tests SearchEngine recommendations served from a RecommendStore."""
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.tmp.name, 'recommends.bin')
+        self.graph_path = os.path.join(self.tmp.name, 'graph.pkl')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def load_engine(self, size: int, **kwargs) -> SearchEngine:
+        """Precomputes recommendations of a new SearchEngine and returns
+        a SearchEngine loaded with them."""
+        engine = build_engine(size)
+        engine.save_all_recommends(self.store_path, p_count=1, **kwargs)
+        engine.save_instance(self.graph_path)
+        return SearchEngine(self.graph_path, self.store_path, sparse=True,
+                            algorithm='lazy_dijkstra')
+
+    def test_remove_keeps_store(self) -> None:
+        engine = self.load_engine(12)
+        # past COMPACT_RATIO, remove() must not drop the store
+        for name in ('1', '2', '3', '4'):
+            engine.remove(name)
+        self.assertEqual(engine.pc_path, self.store_path)
+        self.assertEqual(len(engine.removed), 4)
+        for i in range(len(engine.items)):
+            if i not in engine.removed:
+                self.assertFalse(set(engine._recommend(i, 10)) & 
+                                 engine.removed)
+        self.assertTrue(engine.compact())
+        self.assertIsNone(engine.pc_path)
+
+    def test_partial_store_falls_back_to_search(self) -> None:
+        engine = self.load_engine(50, end_index=25)
+        store = engine._get_store()
+        self.assertTrue(store.is_set(10))
+        self.assertFalse(store.is_set(40))
+        self.assertEqual(store.kth_distances()[40], float('inf'))
+        for i in (10, 40):
+            expected = [j for j, _ in engine._nearest(i, 10)]
+            self.assertTrue(expected)
+            self.assertEqual(engine._recommend(i, 10), expected)
+
+
+class PersonalizedPageRankTest(unittest.TestCase):
+    """Tests the personalized_pagerank() SearchEngine backend."""
+    def test_pagerank_uses_sparse_backend(self) -> None:
+        engine = SearchEngine(algorithm='personalized_pagerank')
+        for name in range(10):
+            engine.add_item(SearchItem(str(name), tags=set()), 
+                            pair_weight, 0.5)
+        self.assertIsInstance(engine.graph, SparseAdjacency)
+        dense = build_engine(10)
+        dense.graph = [[dense.graph.get_weight(i, j) if i != j else 0 
+                        for j in range(10)] for i in range(10)]
+        self.assertEqual([i for i, _ in engine._nearest(0, 5)], 
+                         [i for i, _ in personalized_pagerank(dense, 0, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
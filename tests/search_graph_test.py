@@ -0,0 +1,162 @@
+"""This file contains regression tests for SearchGraph item removal,
+compaction, snapshots, pickling, decayed interests and frozen WordTries.
+"""
+import unittest # for unit testing
+import tempfile # for snapshot files
+import pickle # for pickle round trips
+import copy # for deep copies
+import sys # for import from parent directory
+import os # for import from parent directory
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+from src.graphs.search_graph import SearchGraph
+from src.graphs.search_item import SearchItem
+from src.search_engine.search_engine import SearchEngine
+
+
+def pair_weight(item1: SearchItem, item2: SearchItem) -> float:
+    """Returns a deterministic symmetric float weight of two SearchItems
+    named by ints."""
+    a, b = int(item1.get_name()), int(item2.get_name())
+    return ((a + b) * 7 % 10 + abs(a - b) % 3) / 10
+
+
+def build_graph(names: list[int], sparse: bool) -> SearchGraph:
+    """Returns a SearchGraph of SearchItems named by the given ints."""
+    graph = SearchGraph(sparse=sparse)
+    for name in names:
+        graph.add_item(SearchItem(str(name), tags={f'tag{name % 3}'}),
+                       pair_weight, 0.5)
+    return graph
+
+
+def edges_by_name(graph: SearchGraph) -> dict[str, set[tuple[str, float]]]:
+    """Returns the edges of every SearchItem by item names."""
+    return {item.get_name(): {(graph.items[j].get_name(), weight) 
+                              for j, weight in graph.get_edges(i)}
+            for i, item in enumerate(graph.items) if i not in graph.removed}
+
+
+class SearchGraphRemoveTest(unittest.TestCase):
+    """Tests SearchGraph.remove() and compact() against a SearchGraph
+    rebuilt without the removed SearchItems."""
+    def test_compact_matches_rebuilt_graph(self) -> None:
+        for sparse in (False, True):
+            graph = build_graph(range(20), sparse)
+            for name in (3, 7, 8, 15):
+                graph.remove(str(name))
+            graph.compact()
+            rebuilt = build_graph([i for i in range(20) 
+                                   if i not in (3, 7, 8, 15)], sparse)
+            self.assertEqual(edges_by_name(graph), edges_by_name(rebuilt))
+            self.assertEqual(graph.item_dict, rebuilt.item_dict)
+            self.assertEqual(graph.tag_item, rebuilt.tag_item)
+
+    def test_new_items_skip_removed_indices(self) -> None:
+        for sparse in (False, True):
+            graph = build_graph(range(10), sparse)
+            graph.remove('3')
+            graph.add_item(SearchItem('10', tags={'tag1'}), pair_weight, 1.0)
+            graph.add_item(SearchItem('11', tags={'tag0'}), pair_weight, 1.0,
+                           candidates=SearchGraph.tag_candidates)
+            for i in range(len(graph.items)):
+                self.assertNotIn(3, [j for j, _ in graph.get_edges(i)])
+
+
+class SearchGraphSnapshotTest(unittest.TestCase):
+    """Tests saving a SearchGraph loaded from a snapshot."""
+    def test_snapshot_save_instance_round_trip(self) -> None:
+        graph = build_graph(range(20), sparse=True)
+        graph.remove('5')
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot_path = os.path.join(tmp, 'graph.snap')
+            instance_path = os.path.join(tmp, 'graph.pkl')
+            graph.save_snapshot(snapshot_path)
+            loaded = SearchGraph(snapshot_path)
+            # memory-mapped edges are copied when pickled
+            loaded.save_instance(instance_path)
+            reloaded = SearchGraph(instance_path)
+        self.assertEqual(edges_by_name(reloaded), edges_by_name(graph))
+        self.assertEqual(reloaded.item_dict, graph.item_dict)
+        self.assertEqual(reloaded.removed, graph.removed)
+        
+    def test_pickle_round_trip_keeps_interests_working(self) -> None:
+        engine = SearchEngine(half_life=60.0)
+        for name in range(5):
+            engine.add_item(SearchItem(str(name), tags={f'tag{name % 3}'}),
+                            pair_weight, 0.5)
+        engine.add_click('1')
+        for restored in (pickle.loads(pickle.dumps(engine)), 
+                         copy.deepcopy(engine)):
+            # buffered events are not pickled, runtime attributes are new
+            self.assertIsNot(restored._events, engine._events)
+            self.assertIsNone(restored._store)
+            restored.add_click('3')
+            restored.flush_interests()
+            self.assertEqual(restored.trending(1)[0].get_name(), '3')
+
+
+class SearchGraphDecayTest(unittest.TestCase):
+    """Tests time-decayed interests of a SearchGraph with a half life."""
+    def test_flush_after_long_idle_time(self) -> None:
+        graph = SearchGraph(half_life=1.0)
+        for name in range(5):
+            graph.add_item(SearchItem(str(name), tags={f'tag{name % 3}'}),
+                           pair_weight, 0.5)
+        graph.add_click('1')
+        graph.flush_interests()
+        # about 2000 half lives idle, the scale alone would overflow
+        graph.clock.origin -= 2000
+        graph.add_click('2')
+        graph.add_appearance(3)
+        graph.flush_interests()
+        self.assertLess(graph.clock.exponent(), 1.0)
+        self.assertEqual(graph.interests.top(1), (2,))
+        self.assertEqual(graph.words.word_suggestions('', 1), ['2'])
+        
+    def test_rescale_while_frozen_is_applied_on_unfreeze(self) -> None:
+        graph = SearchGraph(half_life=1.0)
+        for name in range(5):
+            graph.add_item(SearchItem(str(name), tags={f'tag{name % 3}'}),
+                           pair_weight, 0.5)
+        graph.add_click('1')
+        graph.flush_interests()
+        graph.words.freeze()
+        # 100 half lives rescale interests while the WordTrie is frozen
+        graph.clock.origin -= 100
+        graph.add_click('2')
+        graph.flush_interests()
+        graph.words.freeze(False)
+        self.assertAlmostEqual(graph.words._find_node('1').score, 
+                               graph.items[1].decayed)
+        graph.add_click('3')
+        graph.flush_interests()
+        self.assertEqual(graph.words.word_suggestions('', 1), ['3'])
+        
+
+class SearchGraphFrozenTest(unittest.TestCase):
+    """Tests that a SearchGraph with a frozen WordTrie rejects adding or
+    removing SearchItems."""
+    def test_frozen_mutations_abort(self) -> None:
+        for sparse in (False, True):
+            graph = build_graph(range(10), sparse)
+            edges = edges_by_name(graph)
+            graph.words.freeze()
+            graph.add_item(SearchItem('10', tags={'tag1'}), pair_weight, 0.5)
+            graph.add_items([SearchItem('11', tags={'tag2'})], 
+                            pair_weight, 0.5)
+            graph.remove('3')
+            self.assertEqual(len(graph.items), 10)
+            self.assertEqual(graph.removed, set())
+            self.assertEqual(edges_by_name(graph), edges)
+            self.assertNotIn('10', graph.words)
+            graph.words.freeze(False)
+            graph.remove('3')
+            self.assertNotIn('3', graph.words)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""This file contains benchmarking functions for comparing the runtime
+of the shortest path functions used for recommendations.
+"""
+from random import random, seed
+from statistics import mean # for benchmarking
+from time import time # for benchmarking
+import sys # for import from parent directory
+import os # for import from parent directory
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+from src.graphs.search_graph import SearchGraph
+from src.graphs.search_item import SearchItem
+from src.graphs.search_algorithms import dijkstra, TOP_K_ALGORITHMS
+from src.graphs.search_algorithms import SHORTEST_PATH_ALGORITHMS
+
+
+def block_weight_func(block: list[SearchItem],
+                      items: list[SearchItem]) -> list[list[float]]:
+    return [[random() * 100 for _ in items] for _ in block]
+
+def build_sg(size: int, weight_thres: float, sparse: bool) -> SearchGraph:
+    """Builds a SearchGraph of a given size with random edge weights."""
+    g = SearchGraph(sparse=sparse)
+    g.add_items((SearchItem(str(i), tags=set()) for i in range(size)),
+                block_weight_func, weight_thres)
+    return g
+
+def time_sources(func, g: SearchGraph, sources: list[int]) -> float:
+    """Returns the mean runtime of func over the given sources."""
+    runtimes = []
+    for src in sources:
+        t0 = time()
+        func(g, src)
+        runtimes.append(time() - t0)
+    return mean(runtimes)
+
+def benchmark(size: int=5000,
+              weight_thres: float=0.5,
+              limit: int=100,
+              trials: int=20) -> None:
+    """Compares the full MinHeap dijkstra() against the top-k shortest
+    path functions, and reports the personalized_pagerank() runtime."""
+    seed(0)
+    sources = list(range(0, size, size // trials))
+    for sparse in (False, True):
+        g = build_sg(size, weight_thres, sparse)
+        backend = 'sparse' if sparse else 'dense'
+        base = time_sources(dijkstra, g, sources)
+        print(f'{backend} dijkstra (full): {base * 1000:.2f} ms')
+        for name, top_k in TOP_K_ALGORITHMS.items():
+            runtime = time_sources(lambda g, src: top_k(g, src, limit),
+                                   g, sources)
+            # random walk ranking is not comparable to shortest paths
+            if name not in SHORTEST_PATH_ALGORITHMS:
+                print(f'{backend} {name} (top {limit}): '
+                      f'{runtime * 1000:.2f} ms.')
+                continue
+            full = time_sources(lambda g, src: top_k(g, src, size),
+                                g, sources)
+            print(f'{backend} {name} (top {limit}): {runtime * 1000:.2f} ms, '
+                  f'(full): {full * 1000:.2f} ms, '
+                  f'{base / full:.1f}x faster than dijkstra (full).')
+
+
+if __name__ == '__main__':
+    benchmark()
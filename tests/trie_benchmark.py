@@ -0,0 +1,87 @@
+"""This file contains benchmarking functions for comparing the memory
+usage and latency of WordTrie and RadixTrie.
+"""
+import pickle
+import tracemalloc # for benchmarking
+from random import choice, randint, seed
+from statistics import mean # for benchmarking
+from time import time # for benchmarking
+import sys # for import from parent directory
+import os # for import from parent directory
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+from src.trie.radix_trie import RadixTrie
+from src.trie.word_trie import WordTrie
+from src.utils.formatting import wordtrie_format
+
+
+def load_titles() -> list[str]:
+    """Returns the formatted anime titles and tags from the dataset,
+    or generated titles if the dataset is not available."""
+    file_path = os.path.join(os.getcwd(), 'dataset/anime_search_database.pkl')
+    try:
+        with open(file_path, 'rb') as f:
+            anime_database: dict = pickle.load(f)
+    except OSError:
+        print(f'{file_path} not found, using generated titles.')
+        return generate_titles()
+    words = set()
+    for data in anime_database.values():
+        words.add(wordtrie_format(data['title']))
+        words.update(wordtrie_format(tag) for tag in data.get('tags', ()))
+    return list(words)
+
+def generate_titles(size: int=20000) -> list[str]:
+    """Generates a given size of title-like words."""
+    seed(0)
+    syllables = ['ka', 'no', 'shi', 'ro', 'mi', 'ta', 'ra', 'ku', 'se', 'n']
+    words = [''.join(choice(syllables) for _ in range(randint(2, 5)))
+             for _ in range(500)]
+    return [' '.join(choice(words) for _ in range(randint(1, 6)))
+            for _ in range(size)]
+
+def build_trie(trie_class: type, titles: list[str]) -> tuple:
+    """Returns a trie of all titles, its traced memory in bytes
+    and its build time in seconds."""
+    tracemalloc.start()
+    t0 = time()
+    trie = trie_class(titles)
+    runtime = time() - t0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return trie, memory, runtime
+
+def benchmark(limit: int=10, queries: int=2000) -> None:
+    """Compares WordTrie and RadixTrie memory, build time and
+    word_suggestions() latency on the title set. Both tries rank the
+    suggestions by the same random scores."""
+    titles = load_titles()
+    seed(1)
+    prefixes = []
+    for _ in range(queries):
+        title = choice(titles)
+        prefixes.append(title[:randint(1, min(len(title), 8))])
+    scores = {title: float(randint(0, 1000)) for title in titles}
+    print(f'{len(titles)} titles, {queries} prefix queries, '
+          'ranked by score.')
+    for trie_class in (WordTrie, RadixTrie):
+        trie, memory, runtime = build_trie(trie_class, titles)
+        t0 = time()
+        trie.set_scores(scores)
+        score_runtime = time() - t0
+        runtimes = []
+        for prefix in prefixes:
+            t0 = time()
+            trie.word_suggestions(prefix, limit)
+            runtimes.append(time() - t0)
+        print(f'{trie_class.__name__}: {trie.node_count} nodes, '
+              f'{memory / 2**20:.1f} MiB, built in {runtime:.2f} s, '
+              f'scored in {score_runtime:.2f} s, '
+              f'{mean(runtimes) * 1e6:.1f} us per query.')
+
+
+if __name__ == '__main__':
+    benchmark()